@@ -1,12 +1,34 @@
-import tkinter as tk
-from PIL import Image, ImageTk
-import random
 import os
-import pygame
+import sys
+import threading
+import time
+
+# Launch time, for the time-to-first-interactive-frame milestone
+STARTED = time.perf_counter()
+
+# Shared headless quiz logic lives in ../portfolio_core
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from portfolio_core.quiz import (QUESTIONS_PER_QUIZ, randomInt, decideOperation,
+                                 score_attempt, calculateGrade)
+from portfolio_core.profiling import profiler_from_env
+from portfolio_core.watchdog import LoopWatchdog
+from portfolio_core.assets import load_photo
+from portfolio_core.audio import AudioService
+
+# tkinter is only imported by main() and pygame only once the menu is on
+# screen (PIL only while the asset cache is cold), so this module can be
+# imported without a display or sound device
+tk = None
+profiler = None
+
+# Feedback sounds, each decoded the first time it plays and mixed so they can overlap
+SOUNDS = {"correct": "correct.wav", "wrong": "wrong.wav", "finish": "finish.wav"}
+audio = None
 
 WINDOW_W, WINDOW_H = 650, 550
 BG_FILE = "mathquiz_bg.png"  # Background image for the quiz
 BTN_FILE = "button_retro.png"  # Button image (retro style)
+MUSIC_FILE = "mathquiz_bg_music.wav"  # Background music, streamed by pygame
 
 selected_difficulty = None
 score = 0
@@ -14,70 +36,41 @@ question_number = 1
 attempt = 1
 current_answer = None
 
-# 🎵 Set up pygame to handle music and sound effects
-pygame.mixer.init()
-
-# Load background music and set it to loop forever
-pygame.mixer.music.load("mathquiz_bg_music.wav")  # Background music file
-pygame.mixer.music.set_volume(0.5)
-pygame.mixer.music.play(-1)
-
-# Load sound effects for feedback
-sfx_correct = pygame.mixer.Sound("correct.wav")
-sfx_wrong = pygame.mixer.Sound("wrong.wav")
-sfx_finish = pygame.mixer.Sound("finish.wav")
-
-# Create main window
-root = tk.Tk()
-root.title("Retro Math Quiz")
-root.geometry(f"{WINDOW_W}x{WINDOW_H}")
-root.resizable(False, False)
-root.eval('tk::PlaceWindow . center')
-root.iconbitmap("mathquiz.ico")  # Window icon
-
-# Canvas to handle all drawing
-canvas = tk.Canvas(root, width=WINDOW_W, height=WINDOW_H, highlightthickness=0, bd=0)
-canvas.pack(fill="both", expand=True)
-
-# Load images
-bg_img = Image.open(BG_FILE).resize((WINDOW_W, WINDOW_H))
-bg_photo = ImageTk.PhotoImage(bg_img)
-
-btn_img = Image.open(BTN_FILE)
-BTN_W, BTN_H = 220, 44
-btn_photo = ImageTk.PhotoImage(btn_img.resize((BTN_W, BTN_H)))
-
-# Draw the background image on the canvas
-bg_id = canvas.create_image(0, 0, image=bg_photo, anchor="nw")
-
-# Keep track of all items drawn on canvas so we can clear them easily
-screen_items = []
-feedback_text_id = None  # Track the feedback text for easy deletion
-
-# Function to clear the screen and remove any active widgets
-def clear_screen():
-    global screen_items, feedback_text_id
-    for item in screen_items:
-        canvas.delete(item)
-    screen_items = []
-    
-    # Remove entry widgets and unbind the Enter key
-    for win_id in canvas.find_withtag("entry_widget"):
-        entry_widget = canvas.itemcget(win_id, "window")
-        if entry_widget:
-            widget = root.nametowidget(entry_widget)
-            widget.unbind("<Return>")
-        canvas.delete(win_id)
-
-    feedback_text_id = None
+# Each screen's canvas items are created once by build_scenes() and tagged
+# "scene_<name>"; switching screens only flips their state, and per-question
+# updates are itemconfig calls on the same items
+scene_items = {"menu": {}, "problem": {}, "results": {}}  # scene -> {name: item id}
+current_scene = None
+answer_entry = None  # the one Entry widget, reused for every question
+
+# Tag an item as part of a scene, optionally remembering it by name
+def add_to_scene(scene, item_id, name=None):
+    canvas.addtag_withtag(f"scene_{scene}", item_id)
+    if name:
+        scene_items[scene][name] = item_id
+    return item_id
+
+# Show one scene and hide the one before it
+def show_scene(scene):
+    global current_scene
+    if current_scene is not None:
+        canvas.itemconfigure(f"scene_{current_scene}", state="hidden")
+    canvas.itemconfigure(f"scene_{scene}", state="normal")
+    current_scene = scene
+    # A hidden Entry keeps keyboard focus, so Enter could still submit an answer
+    if scene != "problem":
+        canvas.focus_set()
+
+# Change a named item of a scene in place
+def update_item(scene, name, **options):
+    canvas.itemconfigure(scene_items[scene][name], **options)
 
 # Utility to create buttons on canvas with image + text
-def create_canvas_button(text, x, y, command, font=("Segoe UI", 10, "bold")):
-    img_id = canvas.create_image(x, y, image=btn_photo)
-    text_id = canvas.create_text(x, y, text=text, font=font, fill="#1B0034")
-    screen_items.extend([img_id, text_id])
+def create_canvas_button(scene, text, x, y, command, font=("Segoe UI", 10, "bold")):
+    img_id = add_to_scene(scene, canvas.create_image(x, y, image=btn_photo))
+    text_id = add_to_scene(scene, canvas.create_text(x, y, text=text, font=font, fill="#1B0034"))
 
-    # Bind the mouse click to the button image and text
+    # Bind the mouse click to the button image and text (once, for the app's lifetime)
     def click(event):
         command()
     canvas.tag_bind(img_id, "<Button-1>", click)
@@ -85,50 +78,66 @@ def create_canvas_button(text, x, y, command, font=("Segoe UI", 10, "bold")):
 
     return img_id, text_id
 
-# Generate a random number based on difficulty
-def randomInt(d):
-    if d == "easy":
-        return random.randint(1, 9)
-    if d == "moderate":
-        return random.randint(10, 99)
-    return random.randint(1000, 9999)
+# Create every screen's items once, all hidden
+def build_scenes():
+    global answer_entry
 
-# Randomly choose + or - for the problem
-def decideOperation():
-    return random.choice(['+', '-'])
+    # Main menu with difficulty options
+    add_to_scene("menu", canvas.create_text(WINDOW_W//2, 140, text="💫 RETRO MATH QUIZ 💫",
+                                            font=("Orbitron", 28, "bold"), fill="#00FFFF"))
+    add_to_scene("menu", canvas.create_text(WINDOW_W//2, 200, text="SELECT DIFFICULTY",
+                                            font=("Arial", 14, "bold"), fill="#FF00FF"))
+    y = 230
+    create_canvas_button("menu", "Easy (1-digit)", WINDOW_W//2, y+40, lambda: start_quiz("easy"))
+    create_canvas_button("menu", "Moderate (2-digit)", WINDOW_W//2, y+90, lambda: start_quiz("moderate"))
+    create_canvas_button("menu", "Advanced (4-digit)", WINDOW_W//2, y+140, lambda: start_quiz("advanced"))
+    create_canvas_button("menu", "QUIT", WINDOW_W//2, y+190, lambda: root.destroy())
+
+    # Question screen: number, problem, answer entry, feedback and score
+    add_to_scene("problem", canvas.create_text(WINDOW_W//2, 70, text="",
+                                               font=("Arial", 16, "bold"), fill="#FFD700"), "header")
+    add_to_scene("problem", canvas.create_text(WINDOW_W//2, 170, text="",
+                                               font=("Orbitron", 40, "bold"), fill="#00FFFF"), "question")
+    answer_entry = tk.Entry(root, font=("Arial", 20, "bold"), width=8,
+                 justify="center", bg="#2A0033", fg="#00FFFF",
+                 insertbackground="#00FFFF", relief="flat",
+                 highlightthickness=2, highlightbackground="#2A0033",
+                 highlightcolor="#2A0033", bd=5)
+    add_to_scene("problem", canvas.create_window(WINDOW_W//2, 260, window=answer_entry,
+                                                 width=180, height=40), "entry")
+    # Submit button and Enter key both check the answer
+    create_canvas_button("problem", "SUBMIT", WINDOW_W//2, 320,
+                         lambda: checkAnswer(answer_entry.get()))
+    answer_entry.bind("<Return>", lambda event: checkAnswer(answer_entry.get()))
+    add_to_scene("problem", canvas.create_text(WINDOW_W//2, 370, text="",
+                                               font=("Arial", 14, "bold"), fill="#FFFFFF"), "feedback")
+    add_to_scene("problem", canvas.create_text(WINDOW_W//2, WINDOW_H-30, text="",
+                                               font=("Arial", 12, "bold"), fill="#FFD700"), "score")
+
+    # Results screen
+    add_to_scene("results", canvas.create_text(WINDOW_W//2, 110, text="QUIZ OVER",
+                                               font=("Orbitron", 30, "bold"), fill="#FF00FF"))
+    add_to_scene("results", canvas.create_text(WINDOW_W//2, 190, text="",
+                                               font=("Arial", 20, "bold"), fill="#00FFFF"), "final")
+    add_to_scene("results", canvas.create_text(WINDOW_W//2, 240, text="",
+                                               font=("Arial", 20, "bold"), fill="#FFD700"), "rank")
+    create_canvas_button("results", "PLAY AGAIN", WINDOW_W//2, 340, displayMenu)
+    create_canvas_button("results", "EXIT", WINDOW_W//2, 400, root.destroy)
+
+    for scene in scene_items:
+        canvas.itemconfigure(f"scene_{scene}", state="hidden")
 
 # Display the main menu with difficulty options
 def displayMenu():
-    clear_screen()
-    t1 = canvas.create_text(WINDOW_W//2, 140, text="💫 RETRO MATH QUIZ 💫",
-                             font=("Orbitron", 28, "bold"), fill="#00FFFF")
-    t2 = canvas.create_text(WINDOW_W//2, 200, text="SELECT DIFFICULTY",
-                             font=("Arial", 14, "bold"), fill="#FF00FF")
-    screen_items.extend([t1, t2])
-
-    y = 230
-    create_canvas_button("Easy (1-digit)", WINDOW_W//2, y+40, lambda: start_quiz("easy"))
-    create_canvas_button("Moderate (2-digit)", WINDOW_W//2, y+90, lambda: start_quiz("moderate"))
-    create_canvas_button("Advanced (4-digit)", WINDOW_W//2, y+140, lambda: start_quiz("advanced"))
-    create_canvas_button("QUIT", WINDOW_W//2, y+190, lambda: root.destroy())
+    show_scene("menu")
 
 # Display a temporary feedback message (correct/wrong)
 def show_feedback(msg, color="#FFFFFF"):
-    global feedback_text_id
-    if feedback_text_id is not None:
-        canvas.delete(feedback_text_id)
-    feedback_text_id = canvas.create_text(WINDOW_W//2, 370, text=msg, font=("Arial", 14, "bold"), fill=color)
-    screen_items.append(feedback_text_id)
-
-# IDs to keep track of current question, score, and entry widget
-question_text_id = None
-score_text_id = None
-entry_window_id = None
+    update_item("problem", "feedback", text=msg, fill=color)
 
 # Display a math problem based on selected difficulty
 def displayProblem():
-    global question_text_id, score_text_id, entry_window_id, attempt, current_answer
-    clear_screen()
+    global attempt, current_answer
     attempt = 1
 
     num1 = randomInt(selected_difficulty)
@@ -136,37 +145,16 @@ def displayProblem():
     op = decideOperation()
     current_answer = num1 + num2 if op == '+' else num1 - num2
 
-    # Show question number
-    h = canvas.create_text(WINDOW_W//2, 70, text=f"QUESTION {question_number}/10",
-                           font=("Arial", 16, "bold"), fill="#FFD700")
-    # Show the math problem
-    q = canvas.create_text(WINDOW_W//2, 170, text=f"{num1} {op} {num2} =",
-                           font=("Orbitron", 40, "bold"), fill="#00FFFF")
-    screen_items.extend([h, q])
-    question_text_id = q
-
-    # Create entry for user answer
-    entry = tk.Entry(root, font=("Arial", 20, "bold"), width=8,
-                 justify="center", bg="#2A0033", fg="#00FFFF",
-                 insertbackground="#00FFFF", relief="flat",
-                 highlightthickness=2, highlightbackground="#2A0033",
-                 highlightcolor="#2A0033", bd=5)
-    entry_window_id = canvas.create_window(WINDOW_W//2, 260, window=entry, width=180, height=40)
-    canvas.addtag_withtag("entry_widget", entry_window_id)
-
-    # Submit button for the answer
-    create_canvas_button("SUBMIT", WINDOW_W//2, 320,
-                         lambda e=entry: checkAnswer(e.get()))
+    # Update question number, problem, score and feedback in place
+    update_item("problem", "header", text=f"QUESTION {question_number}/{QUESTIONS_PER_QUIZ}")
+    update_item("problem", "question", text=f"{num1} {op} {num2} =")
+    update_item("problem", "score", text=f"SCORE: {score}")
+    show_feedback("")
+    show_scene("problem")
 
-    # Show current score at the bottom
-    score_text_id = canvas.create_text(WINDOW_W//2, WINDOW_H-30,
-                                       text=f"SCORE: {score}",
-                                       font=("Arial", 12, "bold"), fill="#FFD700")
-    screen_items.append(score_text_id)
-
-    # Focus the entry field and allow Enter key
-    entry.focus()
-    entry.bind("<Return>", lambda event: checkAnswer(entry.get()))
+    # Clear and focus the answer field
+    answer_entry.delete(0, tk.END)
+    answer_entry.focus()
 
 # Check if the answer is correct
 def checkAnswer(a):
@@ -176,79 +164,56 @@ def checkAnswer(a):
         val = int(a)
     except:
         show_feedback("⚠ Enter a valid number!", "#FF4444")
-        sfx_wrong.play()
+        audio.play("wrong")
         return
 
+    points, done = score_attempt(val == current_answer, attempt)
+
     if val == current_answer:
+        score += points
         if attempt == 1:
-            score += 10
-            show_feedback("🎉 Correct! +10", "#00FF88")
+            show_feedback(f"🎉 Correct! +{points}", "#00FF88")
         else:
-            score += 5
-            show_feedback("✅ Correct! +5", "#66FF99")
-        sfx_correct.play()
+            show_feedback(f"✅ Correct! +{points}", "#66FF99")
+        audio.play("correct")
 
         # Update score display
-        canvas.delete(score_text_id)
-        new_scr = canvas.create_text(WINDOW_W//2, WINDOW_H-30,
-                                     text=f"SCORE: {score}",
-                                     font=("Arial", 12, "bold"), fill="#FFD700")
-        screen_items.append(new_scr)
+        update_item("problem", "score", text=f"SCORE: {score}")
 
         # Move to next question after a short delay
-        root.after(800, nextQuestion)
+        watchdog.after(800, nextQuestion)
         return
 
     # First wrong attempt
-    if attempt == 1:
+    if not done:
         attempt += 1
         show_feedback("❌ Wrong! Try again.", "#FF4444")
-        sfx_wrong.play()
-        for child in root.winfo_children():
-            if isinstance(child, tk.Entry):
-                child.delete(0, tk.END)
-                child.focus()
+        audio.play("wrong")
+        answer_entry.delete(0, tk.END)
+        answer_entry.focus()
         return
 
     # Second wrong attempt, show correct answer
     show_feedback(f"💀 Wrong again! {current_answer}", "#FF4444")
-    sfx_wrong.play()
-    root.after(1000, nextQuestion)
+    audio.play("wrong")
+    watchdog.after(1000, nextQuestion)
 
 # Move to the next question or end quiz
 def nextQuestion():
     global question_number
     question_number += 1
-    if question_number > 10:
+    if question_number > QUESTIONS_PER_QUIZ:
         displayResults()
     else:
         displayProblem()
 
 # Display final score and rank
 def displayResults():
-    clear_screen()
-    show_feedback("")  # Remove any lingering messages
-    t = canvas.create_text(WINDOW_W//2, 110, text="QUIZ OVER",
-                           font=("Orbitron", 30, "bold"), fill="#FF00FF")
-    s = canvas.create_text(WINDOW_W//2, 190, text=f"FINAL SCORE: {score}/100",
-                           font=("Arial", 20, "bold"), fill="#00FFFF")
-    g = canvas.create_text(WINDOW_W//2, 240, text=f"RANK: {calculateGrade(score)}",
-                           font=("Arial", 20, "bold"), fill="#FFD700")
-    screen_items.extend([t, s, g])
-
-    sfx_finish.play()
-
-    create_canvas_button("PLAY AGAIN", WINDOW_W//2, 340, displayMenu)
-    create_canvas_button("EXIT", WINDOW_W//2, 400, root.destroy)
-
-# Calculate letter grade based on score
-def calculateGrade(s):
-    if s >= 90: return "A+ 🌟"
-    if s >= 80: return "A"
-    if s >= 70: return "B"
-    if s >= 60: return "C"
-    if s >= 50: return "D"
-    return "F ❌"
+    update_item("results", "final", text=f"FINAL SCORE: {score}/100")
+    update_item("results", "rank", text=f"RANK: {calculateGrade(score)}")
+    show_scene("results")
+
+    audio.play("finish")
 
 # Start the quiz with chosen difficulty
 def start_quiz(d):
@@ -258,6 +223,89 @@ def start_quiz(d):
     question_number = 1
     displayProblem()
 
-# Launch the main menu
-displayMenu()
-root.mainloop()
+# ---------- Startup ----------
+# Only what the menu needs runs before it is painted; audio waits for the first frame
+
+# The canvas's first Expose means the window is mapped; the idle callback runs
+# once Tk has finished redrawing it
+def on_first_expose(event):
+    canvas.unbind("<Expose>")
+    root.after_idle(on_first_frame)
+
+# The menu is on screen and answering clicks: note the time, then start audio
+def on_first_frame():
+    if profiler:
+        profiler.milestone("time to first interactive frame", time.perf_counter() - STARTED)
+    threading.Thread(target=start_background_audio, daemon=True).start()
+
+# Import pygame, start the looping music and open the sound-effect backend,
+# all off the Tk thread
+def start_background_audio():
+    try:
+        import pygame
+    except ImportError:
+        pygame = None
+    if pygame:
+        try:
+            # 🎵 Music is streamed from disk by pygame and loops forever
+            pygame.mixer.init()
+            pygame.mixer.music.load(MUSIC_FILE)
+            pygame.mixer.music.set_volume(0.5)
+            pygame.mixer.music.play(-1)
+        except pygame.error:
+            pass  # no sound device or music file; the quiz works without music
+    audio.start()
+
+# Create the window, load assets and start the quiz
+def main():
+    global tk, root, canvas, bg_photo, btn_photo, bg_id, watchdog
+    global audio, profiler
+    import tkinter as tk
+
+    # Opt-in profiling (PORTFOLIO_PROFILE=1 or --profile), started before any loading
+    profiler = profiler_from_env("mathquiz")
+    if profiler:
+        profiler.instrument_module(globals())
+
+    # Nothing is decoded or opened yet (see start_background_audio)
+    audio = AudioService(SOUNDS, lazy=True)
+
+    # Create main window
+    root = tk.Tk()
+    root.title("Retro Math Quiz")
+    root.geometry(f"{WINDOW_W}x{WINDOW_H}")
+    root.resizable(False, False)
+    root.eval('tk::PlaceWindow . center')
+    root.iconbitmap("mathquiz.ico")  # Window icon
+    # Question delays are scheduled through this so late ones get logged
+    watchdog = LoopWatchdog(root)
+
+    # Canvas to handle all drawing
+    canvas = tk.Canvas(root, width=WINDOW_W, height=WINDOW_H, highlightthickness=0, bd=0)
+    canvas.pack(fill="both", expand=True)
+    if profiler:
+        profiler.watch_canvas(canvas)
+        profiler.watch_loop(root)
+
+    # Load images (resized once, then read from the asset cache without PIL)
+    bg_photo = load_photo(BG_FILE, (WINDOW_W, WINDOW_H))
+
+    BTN_W, BTN_H = 220, 44
+    btn_photo = load_photo(BTN_FILE, (BTN_W, BTN_H))
+
+    # Draw the background image on the canvas
+    bg_id = canvas.create_image(0, 0, image=bg_photo, anchor="nw")
+
+    # Build every screen once, then launch the main menu
+    build_scenes()
+    displayMenu()
+    canvas.bind("<Expose>", on_first_expose)
+    root.mainloop()
+    watchdog.close()
+    audio.close()
+    if profiler:
+        print(audio.latency_report(), file=sys.stderr)
+        profiler.finish()
+
+if __name__ == "__main__":
+    main()
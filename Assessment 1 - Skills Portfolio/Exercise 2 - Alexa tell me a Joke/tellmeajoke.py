@@ -1,130 +1,190 @@
-import tkinter as tk
-from PIL import Image, ImageTk, ImageSequence
-import random
 import os
-import winsound
+import queue
+import sys
+import threading
+
+# Shared headless joke logic lives in ../portfolio_core
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from portfolio_core.jokes import load_jokes, pick_joke
+from portfolio_core.profiling import profiler_from_env
+from portfolio_core.watchdog import LoopWatchdog
+from portfolio_core.assets import (cached_image_path, load_gif_manifest, load_photo,
+                                   save_gif_manifest, save_to_cache)
+from portfolio_core.audio import AudioService
+
+# tkinter is only imported by main(), so this module can be imported without
+# a display; PIL is only needed when the asset cache is cold
+tk = None
+
+# Sound effects, decoded once by main() and mixed so they can overlap
+SOUNDS = {"click": "click.WAV", "punchline": "punchline.WAV"}
+audio = None
 
 
 # Play sound when buttons are clicked
 def play_click():
-    winsound.PlaySound("click.wav", winsound.SND_ASYNC)
+    audio.play("click")
 
 # Play special sound when punchline is revealed
 def play_punchline():
-    winsound.PlaySound("punchline.wav", winsound.SND_ASYNC)
-
-
-# Load jokes from text file and split into setup/punchline pairs
-def load_jokes():
-    jokes = []
-    with open("randomJokes.txt", "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            # Split joke at question mark into setup and punchline
-            if "?" in line:
-                setup, punchline = line.split("?", 1)
-                jokes.append((setup + "?", punchline))
-    return jokes
-
-# Store all loaded jokes in memory
-jokes = load_jokes()
-
+    audio.play("punchline")
 
-# Create main application window
-root = tk.Tk()
-root.title("ALEXA TELL ME A JOKE")
-root.geometry("500x500")
-# Prevent window resizing for consistent layout
-root.resizable(False, False)
 
-# Set window icon
-root.iconbitmap("tell_me_a_joke.ico")
-
-# Create drawing canvas that fills the entire window
-canvas = tk.Canvas(root, width=500, height=500, highlightthickness=0, bd=0)
-canvas.pack(fill="both", expand=True)
-
-
-# Load static background image
-bg_png = Image.open("tell_me_a_joke_bg.png").resize((500, 500))
-bg_png_photo = ImageTk.PhotoImage(bg_png)
-
-
-# Load animated GIF frames for special effects
-gif_frames = []
+# Animated GIF shown with the punchline. Frames are decoded on first use by a
+# background thread and kept as images up to a memory budget. Playback loops
+# in order, so an LRU smaller than the GIF would miss on every frame; instead
+# the first GIF_CACHE_FRAMES frames are kept for good and any beyond that are
+# dropped once shown and decoded again next loop.
+# The bundled GIF is 150 frames of 500x500 (about 1 MB each as a Tk photo, 5 s
+# per loop), far over the budget: its first 33 frames stay cached and the rest
+# stream from the decoder, at most GIF_READ_AHEAD frames ahead of playback.
 gif_path = "tell_me_a_joke_bg.gif"
-
-# Only load GIF if file exists
-if os.path.exists(gif_path):
-    gif = Image.open(gif_path)
-    # Extract each frame from the GIF
-    for frame in ImageSequence.Iterator(gif):
-        frame = frame.resize((500, 500))
-        gif_frames.append(ImageTk.PhotoImage(frame))
+GIF_SIZE = (500, 500)
+GIF_CACHE_MB = 32
+GIF_CACHE_FRAMES = GIF_CACHE_MB * 2**20 // (GIF_SIZE[0] * GIF_SIZE[1] * 4)
+GIF_READ_AHEAD = 4      # decoded frames waiting for the Tk thread
+GIF_BUILDS_PER_TICK = 2  # PhotoImages made per frame shown, so no tick stalls
+DEFAULT_FRAME_MS = 80   # used when a frame doesn't give its own duration
+GIF_WAIT_MS = 10        # re-check delay while the next frame is still decoding
+
+gif_cache = {}             # frame index -> PhotoImage
+gif_durations = {}         # frame index -> ms, from the GIF itself
+gif_frame_count = None     # known once the decoder has reached the last frame
+gif_decoded = queue.Queue(maxsize=GIF_READ_AHEAD)
+gif_decoder = None
 
 # Track animation state
 gif_running = False
 gif_index = 0
-
-
-# Animate GIF frames continuously
+gif_after_id = None
+gif_shown = None  # the frame on screen, kept alive even if the cache drops it
+
+
+# Decode and resize GIF frames in order, looping, a few frames ahead of playback
+def decode_gif_frames():
+    frames = load_gif_manifest(gif_path, GIF_SIZE)
+    if frames is not None:
+        # Every frame is already resized on disk; hand over the file names
+        while True:
+            for i, (frame_path, duration) in enumerate(frames):
+                gif_decoded.put((i, frame_path, duration))
+            gif_decoded.put((None, len(frames), None))  # frame count marker
+
+    from PIL import Image
+    durations = []  # filled on the first pass, which also fills the disk cache
+    with Image.open(gif_path) as gif:
+        i = 0
+        while True:
+            frame = gif.convert("RGBA").resize(GIF_SIZE)
+            duration = gif.info.get("duration") or DEFAULT_FRAME_MS
+            if durations is not None:
+                save_to_cache(frame, cached_image_path(gif_path, GIF_SIZE, i))
+                durations.append(duration)
+            # Blocks once GIF_READ_AHEAD frames are waiting, so memory stays bounded
+            gif_decoded.put((i, frame, duration))
+            i += 1
+            try:
+                gif.seek(i)
+            except EOFError:
+                if durations is not None:
+                    save_gif_manifest(gif_path, GIF_SIZE, durations)
+                    durations = None
+                gif_decoded.put((None, i, None))  # frame count marker
+                i = 0
+                gif.seek(0)
+
+
+# Start the decoder the first time the GIF is needed
+def start_gif_decoder():
+    global gif_decoder
+    if gif_decoder is None:
+        gif_decoder = threading.Thread(target=decode_gif_frames, daemon=True)
+        gif_decoder.start()
+
+
+# Turn decoded frames into PhotoImages (Tk objects must be made on this thread)
+def collect_decoded_frames():
+    global gif_frame_count
+    built = 0
+    while built < GIF_BUILDS_PER_TICK:
+        # Once every frame fits in the cache the decoder is left blocked for good
+        if gif_frame_count and len(gif_cache) >= gif_frame_count:
+            return
+        # Frames past the budget wait here only until shown; don't run ahead
+        if len(gif_cache) >= GIF_CACHE_FRAMES + GIF_READ_AHEAD:
+            return
+        try:
+            i, frame, duration = gif_decoded.get_nowait()
+        except queue.Empty:
+            return
+        if i is None:
+            gif_frame_count = frame
+            continue
+        gif_durations[i] = duration
+        if i in gif_cache:
+            continue
+        if isinstance(frame, str):
+            gif_cache[i] = tk.PhotoImage(file=frame)
+        else:
+            from PIL import ImageTk
+            gif_cache[i] = ImageTk.PhotoImage(frame)
+        built += 1
+
+
+# Animate GIF frames continuously, at the GIF's own frame rate
 def play_gif():
-    global gif_running, gif_index
+    global gif_index, gif_after_id, gif_shown
 
     # Stop if animation is disabled
     if not gif_running:
         return
 
+    collect_decoded_frames()
+    if gif_frame_count and gif_index >= gif_frame_count:
+        gif_index = 0
+    frame = gif_cache.get(gif_index)
+    if frame is None:
+        # Still decoding; keep the current frame up and look again shortly
+        gif_after_id = watchdog.after(GIF_WAIT_MS, play_gif)
+        return
+
     # Display current frame and advance to next
-    canvas.itemconfig(background_image_id, image=gif_frames[gif_index])
-    gif_index = (gif_index + 1) % len(gif_frames)
+    canvas.itemconfig(background_image_id, image=frame)
+    gif_shown = frame
+    if gif_index >= GIF_CACHE_FRAMES:
+        del gif_cache[gif_index]  # over budget; decoded again next loop
+    delay = gif_durations.get(gif_index, DEFAULT_FRAME_MS)
+    gif_index += 1
 
-    # Schedule next frame update (80ms delay for smooth animation)
-    root.after(80, play_gif)
+    # The watchdog logs frames that start late or take too long
+    gif_after_id = watchdog.after(delay, play_gif)
 
 
 # Switch to static background image
 def show_png_background():
-    global gif_running
+    global gif_running, gif_after_id
     gif_running = False
+    if gif_after_id is not None:
+        root.after_cancel(gif_after_id)
+        gif_after_id = None
     canvas.itemconfig(background_image_id, image=bg_png_photo)
 
 
 # Switch to animated background
 def show_gif_background():
     global gif_running
+    # Nothing to animate without the file, and only one frame loop at a time
+    if not os.path.exists(gif_path) or gif_running:
+        return
+    start_gif_decoder()
     gif_running = True
     play_gif()
 
 
-# Create background image on canvas
-background_image_id = canvas.create_image(0, 0, image=bg_png_photo, anchor="nw")
-
-
-# Create text area for joke setup
-setup_text_id = canvas.create_text(
-    250, 145,
-    text="Click the button to hear a joke!",
-    fill="black",
-    font=("Segoe UI", 20, "bold"),
-    justify="center",
-    width=380  # Text will wrap within this width
-)
-
-# Create text area for punchline (initially hidden)
-punchline_text_id = canvas.create_text(
-    250, 240,
-    text="",
-    fill="black",
-    font=("Segoe UI", 16, "bold"),
-    justify="center",
-    width=380
-)
-
-
 # Store current joke being displayed
 current_setup = ""
 current_punchline = ""
+# Track if this is the first joke request
 first_click_done = False
 
 
@@ -136,7 +196,7 @@ def new_joke():
 
     global current_setup, current_punchline
     # Pick random joke from loaded collection
-    current_setup, current_punchline = random.choice(jokes)
+    current_setup, current_punchline = pick_joke(jokes)
 
     # Update display with new joke setup
     canvas.itemconfig(setup_text_id, text=current_setup)
@@ -157,11 +217,6 @@ def show_punchline():
     canvas.itemconfig(punchline_text_id, text=current_punchline)
 
 
-# Load button background image
-rounded_btn_img = Image.open("button_rounded.png").resize((160, 35))
-rounded_btn_photo = ImageTk.PhotoImage(rounded_btn_img)
-
-
 # Create clickable button on canvas
 def create_canvas_button(text, x, y, command):
     # Create button image
@@ -185,20 +240,97 @@ def create_canvas_button(text, x, y, command):
     return img_id, text_id
 
 
-# Track if this is the first joke request
-first_click_done = False
+# Build the window and start the app
+def main():
+    global audio, jokes, root, canvas, bg_png_photo, rounded_btn_photo, watchdog
+    global tk, background_image_id, setup_text_id, punchline_text_id, alexa_btn_text
+    import tkinter as tk
+
+    # Opt-in profiling (PORTFOLIO_PROFILE=1 or --profile), started before any loading
+    profiler = profiler_from_env("tellmeajoke")
+    if profiler:
+        profiler.instrument_module(globals())
+
+    # Store all loaded jokes in memory
+    jokes = load_jokes()
+    audio = AudioService(SOUNDS)
+
+
+    # Create main application window
+    root = tk.Tk()
+    root.title("ALEXA TELL ME A JOKE")
+    root.geometry("500x500")
+    # Prevent window resizing for consistent layout
+    root.resizable(False, False)
+
+    # Set window icon
+    root.iconbitmap("tell_me_a_joke.ico")
+    watchdog = LoopWatchdog(root)
+
+    # Create drawing canvas that fills the entire window
+    canvas = tk.Canvas(root, width=500, height=500, highlightthickness=0, bd=0)
+    canvas.pack(fill="both", expand=True)
+    if profiler:
+        profiler.watch_canvas(canvas)
+        profiler.watch_loop(root)
+
+
+    # Load static background image (resized once, then read from the asset cache)
+    bg_png_photo = load_photo("tell_me_a_joke_bg.png", (500, 500))
+
+
+    # The GIF isn't touched until the first punchline (see show_gif_background)
+
+
+    # Create background image on canvas
+    background_image_id = canvas.create_image(0, 0, image=bg_png_photo, anchor="nw")
+
+
+    # Create text area for joke setup
+    setup_text_id = canvas.create_text(
+        250, 145,
+        text="Click the button to hear a joke!",
+        fill="black",
+        font=("Segoe UI", 20, "bold"),
+        justify="center",
+        width=380  # Text will wrap within this width
+    )
+
+    # Create text area for punchline (initially hidden)
+    punchline_text_id = canvas.create_text(
+        250, 240,
+        text="",
+        fill="black",
+        font=("Segoe UI", 16, "bold"),
+        justify="center",
+        width=380
+    )
+
+
+    # Load button background image
+    rounded_btn_photo = load_photo("button_rounded.png", (160, 35))
+
+
+    # Create main joke button (text changes after first use)
+    alexa_btn_img, alexa_btn_text = create_canvas_button(
+        "ALEXA TELL ME A JOKE", 250, 310, new_joke
+    )
+
+    # Create punchline reveal button
+    create_canvas_button("SHOW PUNCHLINE", 250, 355, show_punchline)
 
-# Create main joke button (text changes after first use)
-alexa_btn_img, alexa_btn_text = create_canvas_button(
-    "ALEXA TELL ME A JOKE", 250, 310, new_joke
-)
+    # Create quit button with sound effect
+    create_canvas_button("QUIT", 250, 400, lambda: (play_click(), root.destroy()))
 
-# Create punchline reveal button
-create_canvas_button("SHOW PUNCHLINE", 250, 355, show_punchline)
 
-# Create quit button with sound effect
-create_canvas_button("QUIT", 250, 400, lambda: (play_click(), root.destroy()))
+    # Start the application event loop
+    root.mainloop()
+    watchdog.close()
+    audio.close()
+    if profiler:
+        print(audio.latency_report(), file=sys.stderr)
+        profiler.finish()
 
 
-# Start the application event loop
-root.mainloop()
+if __name__ == "__main__":
+    main()
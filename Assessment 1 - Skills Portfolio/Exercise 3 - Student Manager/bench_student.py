@@ -0,0 +1,231 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Shared headless student logic lives in ../portfolio_core
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from portfolio_core.student_store import (StudentIndex, StudentRanking, StudentStats,
+                                          StudentStore, format_line, parse_lines, recalc_record)
+from portfolio_core.student_columns import StudentColumns, np
+from portfolio_core.student_format import format_student_minimal
+from portfolio_core.student_binary import BinaryStudentStore, write_binary
+
+DEFAULT_SIZES = (1000, 100000)
+FIRST_NAMES = ["Jake", "Sam", "Lee", "Matt", "Ron", "Jo", "Gareth", "Alan", "Les", "John"]
+# (dict-per-row benchmark, columnar benchmark) pairs reported as speedups
+COLUMN_PAIRS = {"parse": ("parse_dicts", "parse_columns"),
+                "aggregate": ("aggregate_dicts", "aggregate_columns"),
+                "totals + grades": ("derive_dicts", "derive_columns"),
+                "cold load": ("load_cold_dicts", "load_cold_text")}
+LAST_NAMES = ["Hobbs", "Sturtivant", "Scott", "Thompson", "Herrema", "Hyde", "Southgate",
+              "Shearer", "Ferdinand", "Curry"]
+
+# ---------- Synthetic data ----------
+def generate_roster(path, n, seed=0):
+    """Write n random students to path in the studentMarks.txt format"""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{n}\n")
+        for i in range(n):
+            # Codes run past 9999 for big rosters so every code stays unique
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+            f.write(f"{1000 + i},{name},{rng.randint(0, 20)},{rng.randint(0, 20)},"
+                    f"{rng.randint(0, 20)},{rng.randint(0, 100)}\n")
+
+# ---------- Measurement ----------
+def measure(func, ops=1, repeat=3):
+    """Best-of-repeat wall time and, from one extra traced run, peak memory"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    # Traced separately so tracemalloc's overhead doesn't skew the timings
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": best, "ops": ops,
+            "ops_per_sec": ops / best if best else float("inf"),
+            "peak_bytes": peak}
+
+def bench_size(n, repeat, workdir, seed=0, lookups=1000):
+    """Run every benchmark against one generated roster of n students"""
+    path = os.path.join(workdir, f"roster_{n}.txt")
+    generate_roster(path, n, seed)
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+
+    students = parse_lines(lines)
+    columns = StudentColumns.from_records(students)
+    index = StudentIndex(students)
+    stats = StudentStats(students)
+    ranking = StudentRanking(students)
+    rng = random.Random(seed)
+    probes = [rng.choice(students) for _ in range(lookups)]
+    codes = [s["code"] for s in probes]
+    names = [s["name"].split()[-1] for s in probes]  # unique trailing number
+    out_path = os.path.join(workdir, f"roster_{n}.out")
+    bin_path = os.path.join(workdir, f"roster_{n}.bin")
+    write_binary(bin_path, students)
+
+    def dict_aggregate():
+        pcts = [s["percentage"] for s in students]
+        return sum(pcts) / len(pcts), max(students, key=lambda x: x["percentage"]), \
+            min(students, key=lambda x: x["percentage"])
+
+    def column_aggregate():
+        # What View All, Highest and Lowest read on a fresh load
+        return columns.average_percentage(), columns.argmax(), columns.argmin()
+
+    def dict_derive():
+        # Coursework, total, percentage and grade one row at a time
+        for s in students:
+            recalc_record(s)
+
+    def maintained_aggregate():
+        # What View All, Highest and Lowest read now: kept up to date per edit
+        return stats.mean(), ranking.best(), ranking.worst()
+
+    def stats_edit():
+        # One update's worth of upkeep plus reading every statistic back
+        stats.replace(students[0], students[-1])
+        stats.replace(students[-1], students[0])
+        return stats.summary()
+
+    def index_lookup_code():
+        for code in codes:
+            index.get(code)
+
+    # The name index is built on the first substring search; keep that out of the timings
+    index.find(names[0])
+
+    def index_lookup_name():
+        for name in names:
+            index.find(name)
+
+    def serialise():
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(f"{len(students)}\n")
+            f.writelines(format_line(s) for s in students)
+
+    def cached_load():
+        store = StudentStore(path)
+        store.load()
+        store.load()
+
+    def cold_load_dicts():
+        # The dict-per-row load the columns replaced: every record plus the average
+        with open(path, "r", encoding="utf-8") as f:
+            return StudentStats(parse_lines(f)).mean()
+
+    def cold_load_text():
+        # What View All needs on a fresh start: every record plus the average
+        store = StudentStore(path)
+        store.load()
+        return store.stats.mean()
+
+    def cold_load_binary():
+        store = BinaryStudentStore(bin_path)
+        store.load()
+        try:
+            return store.stats.mean()
+        finally:
+            store.close()
+
+    # Linear scans get fewer probes so big rosters finish in reasonable time
+    linear_probes = codes[:max(1, min(lookups, 10_000_000 // max(n, 1)))]
+
+    def linear_lookup_sample():
+        for code in linear_probes:
+            for s in students:
+                if code == s["code"].lower():
+                    break
+
+    results = {
+        "parse_dicts": measure(lambda: parse_lines(lines), n, repeat),
+        "parse_columns": measure(lambda: StudentColumns.from_lines(lines), n, repeat),
+        "load_cached_store": measure(cached_load, 2, repeat),
+        "load_cold_dicts": measure(cold_load_dicts, n, repeat),
+        "load_cold_text": measure(cold_load_text, n, repeat),
+        "load_cold_binary": measure(cold_load_binary, n, repeat),
+        "aggregate_dicts": measure(dict_aggregate, 1, repeat),
+        "aggregate_columns": measure(column_aggregate, 1, repeat),
+        "derive_dicts": measure(dict_derive, n, repeat),
+        "derive_columns": measure(columns.compute, n, repeat),
+        "aggregate_maintained": measure(maintained_aggregate, 1, repeat),
+        "stats_build": measure(lambda: StudentStats(students), n, repeat),
+        "stats_edit": measure(stats_edit, 1, repeat),
+        "sort_full": measure(lambda: sorted(students, key=lambda x: x["percentage"]), 1, repeat),
+        "ranking_build": measure(lambda: StudentRanking(students), 1, repeat),
+        "ranking_walk": measure(lambda: list(StudentRanking(students).descending()), 1, repeat),
+        "lookup_linear": measure(linear_lookup_sample, len(linear_probes), repeat),
+        "lookup_index_code": measure(index_lookup_code, len(codes), repeat),
+        "lookup_index_name": measure(index_lookup_name, len(names), repeat),
+        "format_reports": measure(lambda: [format_student_minimal(s) for s in students], n, repeat),
+        "serialise": measure(serialise, n, repeat),
+    }
+    os.remove(path)
+    os.remove(bin_path)
+    if os.path.exists(out_path):
+        os.remove(out_path)
+    return results
+
+# ---------- Reporting ----------
+def print_table(report):
+    print(f"NumPy: {report['numpy'] or 'not installed (stdlib array path)'}")
+    for size, results in report["results"].items():
+        print(f"\n{size} students")
+        print(f"  {'benchmark':<20} {'seconds':>10} {'ops/sec':>14} {'peak MB':>9}")
+        for name, r in results.items():
+            print(f"  {name:<20} {r['seconds']:>10.4f} {r['ops_per_sec']:>14,.0f} "
+                  f"{r['peak_bytes'] / 1e6:>9.1f}")
+        print("  columns vs dicts:")
+        for label, (dicts, cols) in COLUMN_PAIRS.items():
+            d, c = results[dicts], results[cols]
+            print(f"    {label:<18} {d['seconds'] / c['seconds']:>7.1f}x faster, peak "
+                  f"{d['peak_bytes'] / 1e6:.1f} MB -> {c['peak_bytes'] / 1e6:.1f} MB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Student Manager data layer on synthetic rosters",
+        epilog="example: python bench_student.py --sizes 1000 100000 --json bench.json")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="roster sizes to generate (default: 1k 100k)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH",
+                        help="write results as JSON ('-' for stdout) for regression tracking")
+    args = parser.parse_args(argv)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__ if np is not None else None,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in args.sizes:
+            report["results"][str(n)] = bench_size(n, args.repeat, workdir, args.seed)
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+    print_table(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -1,503 +1,832 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog, font
-from PIL import Image, ImageTk
 import os
+import sys
+import queue
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
-# File where student data is stored
-FILE = "studentMarks.txt"
+# Shared headless student logic lives in ../portfolio_core
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from portfolio_core.student_store import FILE, open_store, make_record, recalc_record
+from portfolio_core.student_io import import_csv, export_csv, validate_batch
+from portfolio_core.student_format import format_student
+from portfolio_core.student_reports import REPORT_CHUNK, generate_reports
+from portfolio_core.profiling import profiler_from_env
+from portfolio_core.watchdog import LoopWatchdog
+from portfolio_core.assets import load_photo
+
+# tkinter is only imported by main() (PIL only while the asset cache is cold),
+# so the data functions below can be imported without a display
+tk = None
+filedialog = None
+
+# Parsed roster is cached here and only re-read when the data changes.
+# Set STUDENT_STORE=sqlite (studentMarks.db) or binary (studentMarks.bin) to
+# use another backend instead of the text file.
+store = open_store(os.environ.get("STUDENT_STORE", "text"))
+
+# Records are formatted and inserted this many at a time as the user scrolls
+PAGE_SIZE = 100
+# Fetch the next page once the bottom of the view passes this scroll fraction
+PAGE_PREFETCH_AT = 0.9
+paged_view = {"records": None, "footer": [], "started": False, "pending": False,
+              "tracked": False, "marks": {}, "next_mark": 0,
+              # Edits to records not paged in yet: code -> new record, or None if deleted
+              "changes": {}, "appended": deque()}
+
+# All store access that touches disk runs on this single worker, so edits are
+# applied one at a time in the order they were made
+worker = ThreadPoolExecutor(max_workers=1)
+# Finished jobs as (on_done, result, error), drained on the Tk thread
+results = queue.Queue()
+POLL_MS = 50
+# note is set from the worker thread to report progress on a long job
+busy = {"jobs": 0, "note": ""}
 
 # ---------- Data handling functions ----------
 def load_data():
-    """Load student data from file and calculate grades"""
-    students = []
+    """Load student data (cached until the file changes on disk), None if missing"""
     # Check if data file exists
-    if not os.path.exists(FILE):
-        show_custom_message("File missing", f"'{FILE}' not found.", "error")
-        return students
-    
-    # Read and clean file data
-    with open(FILE, "r", encoding="utf-8") as f:
-        lines = [ln.rstrip("\n") for ln in f.readlines() if ln.strip() != ""]
-    
-    if not lines:
-        return students
+    if not store.exists():
+        return None
+    return store.load()
+
+def summarise_students():
+    """Snapshot the roster and its running stats (runs on the worker)
+
+    The Tk thread pages through the snapshot, so jobs queued after this one
+    can edit the store without the listing skipping or repeating rows.
+    """
+    students = load_data()
+    if not students:
+        return students, None
+    # Counted in one pass over the total column on load, then kept up to
+    # date by every edit, so this never rescans
+    return store.snapshot(), store.stats.summary()
+
+def edit_summary():
+    """Stats right after an edit (runs on the worker)
+
+    Every store keeps its stats and cached rows in step with its own edits,
+    so this is O(1) and never reloads or copies the roster.
+    """
+    return store.stats.summary()
+
+def warm_store():
+    """Build the store's lookup structures now, so no query pays for it later"""
+    load_data()
+    store.warm()
+
+def save_data(students):
+    """Save student data back to file (full atomic rewrite)"""
+    store.save(students)
+
+def on_close():
+    """Finish queued work and fold journal edits into the data file before exiting"""
+    if os.environ.get("STUDENT_DIALOG_STATS"):
+        print(dialog_latency_report())
+    worker.shutdown(wait=True)
+    if store.journal_entries:
+        store.compact()
+    root.destroy()
+
+# ---------- Background work ----------
+def run_in_background(func, on_done, *args):
+    """Run func(*args) on the worker, then on_done(result) on the Tk thread"""
+    def job():
+        try:
+            results.put((on_done, func(*args), None))
+        except Exception as e:
+            results.put((on_done, None, e))
     
-    # Process each student record
-    for line in lines[1:]:
-        parts = [p.strip() for p in line.split(",")]
-        if len(parts) < 6:
-            continue
+    busy["jobs"] += 1
+    update_busy_indicator()
+    worker.submit(job)
+
+def poll_results():
+    """Deliver finished background jobs to their callbacks"""
+    try:
+        while True:
+            try:
+                on_done, result, error = results.get_nowait()
+            except queue.Empty:
+                break
+            busy["jobs"] -= 1
+            if not busy["jobs"]:
+                busy["note"] = ""
+            update_busy_indicator()
+            if error is None:
+                try:
+                    on_done(result)
+                    continue
+                except Exception as e:
+                    # A failing callback must not stop later results arriving
+                    error = e
+            show_custom_message("Error", f"{type(error).__name__}: {error}", "error")
+    finally:
+        # Rescheduled only once this drain is over, so a modal dialog opened
+        # by a callback never runs a second drain inside it
+        update_busy_indicator()
+        watchdog.after(POLL_MS, poll_results)
+
+def update_busy_indicator():
+    """Show a loading (or progress) note in the header while the worker has jobs"""
+    text = (busy["note"] or "⏳ Loading…") if busy["jobs"] else ""
+    if status_lbl.cget("text") != text:
+        status_lbl.config(text=text)
+
+def with_students(callback, query=None, *args):
+    """Load the roster on the worker and run query(*args) there too, then call
+    callback(count, result) on the Tk thread
+
+    Callbacks only get plain values (the roster size and the query's result),
+    never the live store, so later jobs can edit it while a dialog is open.
+    """
+    def job():
+        students = load_data()
+        if students is None:
+            return None, None
+        return len(students), (query(*args) if query is not None and students else None)
+    
+    def done(result):
+        count, found = result
+        if count is None:
+            show_custom_message("File missing", f"'{FILE}' not found.", "error")
+            count = 0
+        callback(count, found)
+    run_in_background(job, done)
+
+def commit_edit(func, arg, title, message, added=(), updated=(), deleted=()):
+    """Apply a store edit on the worker, then confirm and patch the view
+
+    added/updated are the records and deleted the codes the edit touches, so
+    a full listing on screen can be patched instead of re-rendered.
+    """
+    def apply():
+        func(arg)
+        return edit_summary()
+    
+    def done(summary):
+        finish_edit(title, message, summary, added, updated, deleted)
+    run_in_background(apply, done)
+
+def finish_edit(title, message, summary, added=(), updated=(), deleted=()):
+    """Confirm an applied edit and bring the stats panel and listing up to date"""
+    show_custom_message(title, message)
+    update_stats_panel(summary)
+    patch_listing(summary, added, updated, deleted)
+
+# ---------- Store queries (run on the worker) ----------
+# Lookups and ranking walks happen here rather than on the Tk thread, and hand
+# back copies, so a queued edit can't change what a callback is looking at.
+def copy_record(s):
+    return dict(s) if s is not None else None
+
+def find_student(key):
+    """Copy of the first student whose code or name matches key, or None"""
+    load_data()
+    return copy_record(store.find(key))
+
+def find_students(key, limit):
+    """Copies of up to limit matching students, in file order"""
+    load_data()
+    return [dict(s) for s in store.find_all(key, limit)]
+
+def ranked_student(best):
+    """Copy of the first student with the highest (or lowest) total
+
+    Read off the total column while the roster is still columnar, so this
+    never builds a record per student.
+    """
+    return copy_record(store.best() if best else store.worst())
+
+def ranked_students(ascending):
+    """Every student in order of total, as a list the Tk thread can page through"""
+    load_data()
+    return list(store.ranking.ascending() if ascending else store.ranking.descending())
+
+def code_taken(code):
+    load_data()
+    return store.has_code(code)
+
+def add_new_student(record):
+    """Add record, unless its code was taken while the user filled in the dialogs"""
+    if store.has_code(record["code"]):
+        raise ValueError(f"student code {record['code']} already exists")
+    store.add(record)
+
+def update_existing_student(record):
+    """Update record, unless it was deleted while the user filled in the dialogs"""
+    if not store.has_code(record["code"]):
+        raise ValueError(f"student {record['code']} no longer exists")
+    store.update(record)
+
+def delete_existing_student(code):
+    """Delete code, unless it was removed while the user confirmed"""
+    if not store.delete(code):
+        raise ValueError(f"student {code} not found; it was already removed")
+
+def export_in_order(path, order):
+    """Export the roster in file, ascending or descending order"""
+    load_data()
+    if order == "ascending":
+        records = store.ranking.ascending()
+    elif order == "descending":
+        records = store.ranking.descending()
+    else:
+        records = store.students
+    return export_csv(path, records)
+
+def write_all_reports(path, progress):
+    return generate_reports(load_data(), path, None, REPORT_CHUNK, progress)
+
+# ---------- Custom dialog functions ----------
+# Each kind of dialog is built once, then withdrawn and re-shown with new text
+DIALOG_SIZES = {
+    "message": (400, 150),
+    "yesno": (450, 150),
+    "string": (400, 150),
+    "integer": (450, 180),
+    "sort": (400, 150),
+}
+# Buttons per dialog kind as (text, result, colour); "submit" reads the entry
+DIALOG_BUTTONS = {
+    "message": [("OK", None, "#007acc")],
+    "yesno": [("Yes", True, "#007acc"), ("No", False, "#666")],
+    "string": [("OK", "submit", "#007acc"), ("Cancel", None, "#666")],
+    "integer": [("OK", "submit", "#007acc"), ("Cancel", None, "#666")],
+    "sort": [("Ascending", True, "#007acc"), ("Descending", False, "#666")],
+}
+dialog_pool = {}  # kind -> list of PooledDialog
+dialog_icon = {"ok": None}  # whether student_manager.ico loaded, once known
+# Show latency in ms per (kind, "cold" build or "warm" reuse)
+dialog_latency = {}
+
+def set_dialog_icon(window):
+    """Apply the window icon, giving up for good after the first failure"""
+    if dialog_icon["ok"] is False:
+        return
+    try:
+        window.iconbitmap("student_manager.ico")
+        dialog_icon["ok"] = True
+    except:
+        dialog_icon["ok"] = False
+
+class PooledDialog:
+    """A reusable modal dialog: prompt label, optional entry and buttons"""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.in_use = False
+        self.value = None
+        self.validate = None
+        self.done = tk.BooleanVar(master=root, value=True)
         
-        code = parts[0]
-        name = parts[1]
-        try:
-            # Convert marks to integers
-            c1, c2, c3 = int(parts[2]), int(parts[3]), int(parts[4])
-            exam = int(parts[5])
-        except ValueError:
-            continue
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.geometry("%dx%d" % DIALOG_SIZES[kind])
+        self.window.resizable(False, False)
+        self.window.transient(root)
+        self.window.protocol("WM_DELETE_WINDOW", lambda: self.finish(None))
+        set_dialog_icon(self.window)
         
-        # Calculate totals and grades
-        coursework_total = c1 + c2 + c3
-        overall_total = coursework_total + exam
-        percentage = (overall_total / 160) * 100
-        grade = calc_grade(percentage)
+        # Prompt text
+        if kind == "sort":
+            self.label = tk.Label(self.window, font=("Segoe UI", 11), pady=15)
+        elif kind in ("message", "yesno"):
+            wrap = DIALOG_SIZES[kind][0] - 50
+            self.label = tk.Label(self.window, font=("Segoe UI", 10), wraplength=wrap, pady=15)
+        else:
+            self.label = tk.Label(self.window, font=("Segoe UI", 10), pady=10)
+        self.label.pack()
         
-        students.append({
-            "code": code,
-            "name": name,
-            "c1": c1,
-            "c2": c2,
-            "c3": c3,
-            "coursework": coursework_total,
-            "exam": exam,
-            "total": overall_total,
-            "percentage": percentage,
-            "grade": grade
-        })
-    return students
+        # Input field for text/number prompts, submitted with Enter
+        self.entry = None
+        if kind in ("string", "integer"):
+            self.entry = tk.Entry(self.window, font=("Segoe UI", 10), width=40 if kind == "string" else 20)
+            self.entry.pack(pady=10)
+            self.entry.bind('<Return>', lambda e: self.submit())
+        
+        # Action buttons
+        if kind == "message":
+            tk.Button(self.window, text="OK", command=lambda: self.finish(None),
+                      bg="#007acc", fg="white", font=("Segoe UI", 10), width=10).pack(pady=10)
+            return
+        btn_frame = tk.Frame(self.window)
+        btn_frame.pack(pady=10)
+        for text, result, colour in DIALOG_BUTTONS[kind]:
+            if result == "submit":
+                command = self.submit
+            else:
+                command = lambda r=result: self.finish(r)
+            if kind == "sort":
+                tk.Button(btn_frame, text=text, command=command, bg=colour, fg="white",
+                          font=("Segoe UI", 10), width=10, padx=10).pack(side="left", padx=10)
+            else:
+                tk.Button(btn_frame, text=text, command=command, bg=colour, fg="white",
+                          font=("Segoe UI", 10), width=8).pack(side="left", padx=10 if kind == "yesno" else 5)
 
-def save_data(students):
-    """Save student data back to file"""
-    with open(FILE, "w", encoding="utf-8") as f:
-        f.write(str(len(students)) + "\n")
-        for s in students:
-            f.write(f"{s['code']},{s['name']},{s['c1']},{s['c2']},{s['c3']},{s['exam']}\n")
-
-def calc_grade(p):
-    """Calculate letter grade based on percentage"""
-    if p >= 70: return "A"
-    if p >= 60: return "B"
-    if p >= 50: return "C"
-    if p >= 40: return "D"
-    return "F"
-
-def format_student_minimal(s, show_header=False):
-    """Format student data for display with emojis"""
+    def submit(self):
+        text = self.entry.get()
+        if self.validate is None:
+            self.finish(text)
+            return
+        ok, value = self.validate(text)
+        if ok:
+            self.finish(value)
+        else:
+            # The error message took the grab; take it back for another try
+            self.window.grab_set()
+            self.entry.focus_set()
+
+    def finish(self, value):
+        self.value = value
+        self.window.grab_release()
+        self.window.withdraw()
+        self.done.set(True)
+
+    def show(self, title, text, validate=None):
+        """Show with new text and wait for an answer (None if cancelled)"""
+        self.window.title(title)
+        self.label.config(text=text)
+        self.validate = validate
+        self.value = None
+        if self.entry is not None:
+            self.entry.delete(0, "end")
+        
+        # Center on the main window; the size is fixed so no layout pass is needed
+        w, h = DIALOG_SIZES[self.kind]
+        x = root.winfo_x() + (root.winfo_width() - w) // 2
+        y = root.winfo_y() + (root.winfo_height() - h) // 2
+        self.window.geometry(f"+{x}+{y}")
+        self.window.deiconify()
+        self.window.grab_set()
+        (self.entry or self.window).focus_set()
+        self.done.set(False)
+
+    def wait(self):
+        # Waiting on the user isn't the event loop stalling
+        with watchdog.untimed():
+            root.wait_variable(self.done)
+        return self.value
+
+def show_dialog(kind, title, text, validate=None):
+    """Show a pooled dialog of this kind, building one only if none is free"""
+    start = time.perf_counter()
+    pool = dialog_pool.setdefault(kind, [])
+    dialog = next((d for d in pool if not d.in_use), None)
+    phase = "warm"
+    if dialog is None:
+        dialog = PooledDialog(kind)
+        pool.append(dialog)
+        phase = "cold"
+    
+    dialog.in_use = True
+    try:
+        dialog.show(title, text, validate)
+        dialog_latency.setdefault((kind, phase), []).append((time.perf_counter() - start) * 1000)
+        return dialog.wait()
+    finally:
+        dialog.in_use = False
+
+def dialog_latency_report():
+    """Average show latency of cold (built) versus warm (reused) dialogs"""
     lines = []
-    
-    lines.append(f"🎓 {s['name']}")
-    lines.append(f"🔢 Student ID: {s['code']}")
-    lines.append("")
-    lines.append(f"📊 Coursework: {s['c1']} • {s['c2']} • {s['c3']} → {s['coursework']}/60")
-    lines.append(f"📝 Exam: {s['exam']}/100")
-    lines.append("")
-    lines.append(f"📈 Overall: {s['percentage']:.2f}%")
-    lines.append(f"🏆 Grade: [{s['grade']}]")
-    lines.append("")
-    lines.append("─" * 50)
-    
+    for (kind, phase), samples in sorted(dialog_latency.items()):
+        lines.append(f"{kind:<8} {phase}: {sum(samples) / len(samples):7.2f} ms avg over {len(samples)}")
     return "\n".join(lines)
 
-# Set minimal format as default
-format_student = format_student_minimal
-
-# ---------- Custom dialog functions ----------
 def show_custom_message(title, message, msg_type="info"):
     """Display custom message dialog with icon"""
-    dialog = tk.Toplevel(root)
-    dialog.title(title)
-    dialog.geometry("400x150")
-    dialog.resizable(False, False)
-    dialog.transient(root)
-    dialog.grab_set()
-    
-    # Set window icon
-    try:
-        dialog.iconbitmap("student_manager.ico")
-    except:
-        pass
-    
-    # Center dialog on screen
-    dialog.update_idletasks()
-    x = root.winfo_x() + (root.winfo_width() - dialog.winfo_width()) // 2
-    y = root.winfo_y() + (root.winfo_height() - dialog.winfo_height()) // 2
-    dialog.geometry(f"+{x}+{y}")
-    
-    # Message content
-    tk.Label(dialog, text=message, font=("Segoe UI", 10), wraplength=350, pady=15).pack()
-    
-    # OK button
-    tk.Button(dialog, text="OK", command=dialog.destroy, 
-              bg="#007acc", fg="white", font=("Segoe UI", 10), width=10).pack(pady=10)
-    
-    root.wait_window(dialog)
+    show_dialog("message", title, message)
 
 def ask_custom_yesno(title, question):
     """Custom yes/no confirmation dialog"""
-    dialog = tk.Toplevel(root)
-    dialog.title(title)
-    dialog.geometry("450x150")
-    dialog.resizable(False, False)
-    dialog.transient(root)
-    dialog.grab_set()
-    
-    # Set window icon
-    try:
-        dialog.iconbitmap("student_manager.ico")
-    except:
-        pass
-    
-    # Center dialog
-    dialog.update_idletasks()
-    x = root.winfo_x() + (root.winfo_width() - dialog.winfo_width()) // 2
-    y = root.winfo_y() + (root.winfo_height() - dialog.winfo_height()) // 2
-    dialog.geometry(f"+{x}+{y}")
-    
-    result = {"value": None}
-    
-    def set_result(value):
-        result["value"] = value
-        dialog.destroy()
-    
-    # Question text
-    tk.Label(dialog, text=question, font=("Segoe UI", 10), wraplength=400, pady=15).pack()
-    
-    # Yes/No buttons
-    btn_frame = tk.Frame(dialog)
-    btn_frame.pack(pady=10)
-    
-    tk.Button(btn_frame, text="Yes", command=lambda: set_result(True),
-              bg="#007acc", fg="white", font=("Segoe UI", 10), width=8).pack(side="left", padx=10)
-    tk.Button(btn_frame, text="No", command=lambda: set_result(False),
-              bg="#666", fg="white", font=("Segoe UI", 10), width=8).pack(side="left", padx=10)
-    
-    root.wait_window(dialog)
-    return result["value"]
+    return show_dialog("yesno", title, question)
 
 def custom_askstring(title, prompt):
     """Custom text input dialog"""
-    dialog = tk.Toplevel(root)
-    dialog.title(title)
-    dialog.geometry("400x150")
-    dialog.resizable(False, False)
-    dialog.transient(root)
-    dialog.grab_set()
-    
-    # Set window icon
-    try:
-        dialog.iconbitmap("student_manager.ico")
-    except:
-        pass
-    
-    # Center dialog
-    dialog.update_idletasks()
-    x = root.winfo_x() + (root.winfo_width() - dialog.winfo_width()) // 2
-    y = root.winfo_y() + (root.winfo_height() - dialog.winfo_height()) // 2
-    dialog.geometry(f"+{x}+{y}")
-    
-    result = {"value": None}
-    
-    def submit():
-        result["value"] = entry.get()
-        dialog.destroy()
-    
-    # Prompt label
-    tk.Label(dialog, text=prompt, font=("Segoe UI", 10), pady=10).pack()
-    
-    # Input field
-    entry = tk.Entry(dialog, font=("Segoe UI", 10), width=40)
-    entry.pack(pady=10)
-    entry.focus_set()
-    
-    # Action buttons
-    btn_frame = tk.Frame(dialog)
-    btn_frame.pack(pady=10)
-    
-    tk.Button(btn_frame, text="OK", command=submit,
-              bg="#007acc", fg="white", font=("Segoe UI", 10), width=8).pack(side="left", padx=5)
-    tk.Button(btn_frame, text="Cancel", command=dialog.destroy,
-              bg="#666", fg="white", font=("Segoe UI", 10), width=8).pack(side="left", padx=5)
-    
-    # Submit on Enter key
-    entry.bind('<Return>', lambda e: submit())
-    
-    root.wait_window(dialog)
-    return result["value"]
+    return show_dialog("string", title, prompt)
 
 def custom_askinteger(title, prompt, **kwargs):
     """Custom integer input dialog with validation"""
-    dialog = tk.Toplevel(root)
-    dialog.title(title)
-    dialog.geometry("450x180")
-    dialog.resizable(False, False)
-    dialog.transient(root)
-    dialog.grab_set()
-    
-    # Set window icon
-    try:
-        dialog.iconbitmap("student_manager.ico")
-    except:
-        pass
-    
-    # Center dialog
-    dialog.update_idletasks()
-    x = root.winfo_x() + (root.winfo_width() - dialog.winfo_width()) // 2
-    y = root.winfo_y() + (root.winfo_height() - dialog.winfo_height()) // 2
-    dialog.geometry(f"+{x}+{y}")
-    
-    result = {"value": None}
-    
-    def submit():
+    def validate(text):
         try:
-            value = int(entry.get())
-            # Validate range constraints
-            if 'minvalue' in kwargs and value < kwargs['minvalue']:
-                show_custom_message("Invalid Input", f"Value must be at least {kwargs['minvalue']}", "error")
-                return
-            if 'maxvalue' in kwargs and value > kwargs['maxvalue']:
-                show_custom_message("Invalid Input", f"Value must be at most {kwargs['maxvalue']}", "error")
-                return
-            result["value"] = value
-            dialog.destroy()
+            value = int(text)
         except ValueError:
             show_custom_message("Invalid Input", "Please enter a valid number", "error")
-            entry.focus_set()
+            return False, None
+        # Validate range constraints
+        if 'minvalue' in kwargs and value < kwargs['minvalue']:
+            show_custom_message("Invalid Input", f"Value must be at least {kwargs['minvalue']}", "error")
+            return False, None
+        if 'maxvalue' in kwargs and value > kwargs['maxvalue']:
+            show_custom_message("Invalid Input", f"Value must be at most {kwargs['maxvalue']}", "error")
+            return False, None
+        return True, value
     
     # Show valid range in prompt
     range_text = ""
     if 'minvalue' in kwargs and 'maxvalue' in kwargs:
         range_text = f" ({kwargs['minvalue']}-{kwargs['maxvalue']})"
     
-    tk.Label(dialog, text=prompt + range_text, font=("Segoe UI", 10), pady=10).pack()
-    
-    # Input field
-    entry = tk.Entry(dialog, font=("Segoe UI", 10), width=20)
-    entry.pack(pady=10)
-    entry.focus_set()
-    
-    # Action buttons
-    btn_frame = tk.Frame(dialog)
-    btn_frame.pack(pady=10)
-    
-    tk.Button(btn_frame, text="OK", command=submit,
-              bg="#007acc", fg="white", font=("Segoe UI", 10), width=8).pack(side="left", padx=5)
-    tk.Button(btn_frame, text="Cancel", command=dialog.destroy,
-              bg="#666", fg="white", font=("Segoe UI", 10), width=8).pack(side="left", padx=5)
-    
-    # Submit on Enter key
-    entry.bind('<Return>', lambda e: submit())
-    
-    root.wait_window(dialog)
-    return result["value"]
+    return show_dialog("integer", title, prompt + range_text, validate)
+
+def ask_sort_order():
+    """Ask for ascending (True) or descending (False) order; None if closed"""
+    return show_dialog("sort", "Sort Order", "Choose sort order:")
 
 # ---------- UI action functions ----------
 def set_output(text):
     """Update the main text display area"""
+    # Replacing the text ends any paged listing in progress
+    paged_view["records"] = None
+    paged_view["tracked"] = False
     output_text.config(state="normal")
+    # Marks outlive the text they point at, so drop the old listing's marks
+    names = [n for pair in paged_view["marks"].values() for n in pair]
+    output_text.mark_unset("footer", *names)
+    paged_view["marks"] = {}
+    paged_view["changes"] = {}
+    paged_view["appended"] = deque()
     output_text.delete("1.0", "end")
     output_text.insert("1.0", text)
     output_text.config(state="disabled")
 
-def view_all():
-    """Display all student records with class average"""
-    students = load_data()
-    if not students:
-        set_output("No student records found.")
+def append_output(parts):
+    """Append parts to the display, newline-separated like one joined string"""
+    if not parts:
+        return
+    text = "\n".join(parts)
+    if paged_view["started"]:
+        text = "\n" + text
+    paged_view["started"] = True
+    output_text.config(state="normal")
+    output_text.insert("end-1c", text)
+    output_text.config(state="disabled")
+
+def show_records(records, header=None, footer=(), tracked=False):
+    """Show records a page at a time; later pages are formatted on scroll
+
+    The text ends up identical to joining every formatted record at once, but
+    only the first page is built up front, so the first paint does not depend
+    on the size of the roster. With tracked=True each record's block and the
+    footer are marked so later edits can patch them in place.
+
+    This is append-on-scroll, not a virtual window: pages are never dropped
+    and the scrollbar only spans what has been loaded so far. That keeps the
+    Text widget's own selection, copy and scrolling working over a plain
+    document, at the cost of holding every page the user has scrolled past.
+    """
+    set_output("")
+    paged_view["records"] = overlaid(records) if tracked else iter(records)
+    paged_view["footer"] = list(footer)
+    paged_view["started"] = False
+    paged_view["tracked"] = tracked
+    append_output([header] if header is not None else [])
+    load_next_page()
+
+def load_next_page():
+    """Format and insert the next PAGE_SIZE records of the current listing"""
+    paged_view["pending"] = False
+    records = paged_view["records"]
+    if records is None:
+        return
+    try:
+        page = list(islice(records, PAGE_SIZE))
+    except ValueError:
+        # The snapshot was a mapped binary file that has since been re-read
+        # and closed; list the new one instead
+        view_all()
+        return
+    if paged_view["tracked"]:
+        output_text.config(state="normal")
+        for s in page:
+            insert_record_block(s)
+        output_text.config(state="disabled")
+        parts = []
+    else:
+        parts = [format_student(s) for s in page]
+    if len(page) < PAGE_SIZE:
+        # Listing exhausted; finish with the footer
+        paged_view["records"] = None
+        if paged_view["tracked"]:
+            append_output([""])
+            # Left gravity keeps the mark in front of the footer text
+            output_text.mark_set("footer", "end-1c")
+            output_text.mark_gravity("footer", "left")
+            paged_view["started"] = False
+        parts.extend(paged_view["footer"])
+    append_output(parts)
+
+# ---------- Incremental listing updates ----------
+# Each tracked record block sits between a start and an end mark, both with
+# left gravity so text appended after a block never drags its marks along.
+def insert_record_block(s):
+    """Append one record to a tracked listing between its own pair of marks"""
+    code = s["code"]
+    if code in paged_view["marks"]:
+        # Duplicate codes can't be told apart; edits fall back to a re-render
+        paged_view["tracked"] = False
+    if paged_view["started"]:
+        output_text.insert("end-1c", "\n")
+    paged_view["started"] = True
+    start, end = new_mark_pair(code)
+    output_text.mark_set(start, "end-1c")
+    output_text.mark_gravity(start, "left")
+    output_text.insert("end-1c", format_student(s))
+    output_text.mark_set(end, "end-1c")
+    output_text.mark_gravity(end, "left")
+
+def new_mark_pair(code):
+    """Allocate mark names for a record (codes may hold characters Tk dislikes)"""
+    n = paged_view["next_mark"]
+    paged_view["next_mark"] = n + 1
+    pair = (f"rec{n}_start", f"rec{n}_end")
+    paged_view["marks"][code] = pair
+    return pair
+
+def insert_before_mark(mark, text):
+    """Insert text at mark so the mark ends up after it"""
+    output_text.mark_gravity(mark, "right")
+    output_text.insert(mark, text)
+    output_text.mark_gravity(mark, "left")
+
+def overlaid(records):
+    """Page source for a tracked listing: the snapshot, then records added since
+
+    Edits to records that haven't been paged in yet wait in changes and are
+    applied here as those records come up.
+    """
+    changes = paged_view["changes"]
+    appended = paged_view["appended"]
+    for s in records:
+        if s["code"] in changes:
+            s = changes.pop(s["code"])
+            if s is None:
+                continue
+        yield s
+    while appended:
+        s = appended.popleft()
+        if s["code"] in changes:
+            s = changes.pop(s["code"])
+            if s is None:
+                continue
+        yield s
+
+def patch_listing(summary, added=(), updated=(), deleted=()):
+    """Bring a tracked View All listing up to date with an edit
+
+    Blocks already on screen are rewritten in place. Records not paged in
+    yet are patched as they're paged in, and new records join the end of
+    the listing. Any other view is redrawn with view_all.
+    """
+    marks = paged_view["marks"]
+    changes = paged_view["changes"]
+    loading = paged_view["records"] is not None
+    if not summary["count"] or not paged_view["tracked"] \
+            or any(s["code"] in marks or s["code"] in changes for s in added) \
+            or not loading and (any(s["code"] not in marks for s in updated)
+                                or any(code not in marks for code in deleted)):
+        view_all()
         return
     
-    out = []
-    total_pct = 0
-    for s in students:
-        out.append(format_student(s))
-        total_pct += s["percentage"]
-    
-    # Calculate and display class average
-    avg = total_pct / len(students)
-    out.append(f"\n📊 Total students: {len(students)}")
-    out.append(f"📈 Class Average: {avg:.2f}%")
-    set_output("\n".join(out))
+    output_text.config(state="normal")
+    for code in deleted:
+        if code not in marks:
+            changes[code] = None
+            continue
+        start, end = marks.pop(code)
+        if output_text.compare(end, "<", "end-1c"):
+            # Take the block and the newline that separates it from the next one
+            output_text.delete(start, f"{end} + 1c")
+        elif output_text.compare(start, ">", "1.0"):
+            # Last block loaded so far (Tk's final newline can't be deleted):
+            # take the separator in front of it, the next page adds its own
+            output_text.delete(f"{start} - 1c", end)
+        else:
+            # It was the only text; the next block needs no separator
+            output_text.delete(start, end)
+            paged_view["started"] = False
+        output_text.mark_unset(start, end)
+    for s in updated:
+        if s["code"] not in marks:
+            changes[s["code"]] = s
+            continue
+        start, end = marks[s["code"]]
+        output_text.delete(start, end)
+        insert_before_mark(end, format_student(s))
+    for s in added:
+        if loading:
+            paged_view["appended"].append(s)
+            continue
+        # New records go last, just above the footer
+        start, end = new_mark_pair(s["code"])
+        output_text.mark_set(start, "footer")
+        output_text.mark_gravity(start, "left")
+        insert_before_mark("footer", format_student(s) + "\n")
+        output_text.mark_set(end, "footer - 1c")
+        output_text.mark_gravity(end, "left")
+    
+    if loading:
+        # The footer goes in once the last page is loaded
+        paged_view["footer"] = listing_footer(summary)
+    else:
+        # Footer is everything from its mark to the end of the text
+        output_text.delete("footer", "end-1c")
+        output_text.insert("footer", "\n".join(listing_footer(summary)))
+    output_text.config(state="disabled")
 
-def view_individual():
-    """Find and display a specific student's record"""
-    students = load_data()
+def on_output_scroll(first, last):
+    """Scrollbar hook that pulls in the next page near the bottom"""
+    scroll.set(first, last)
+    if paged_view["records"] is not None and not paged_view["pending"] \
+            and float(last) >= PAGE_PREFETCH_AT:
+        paged_view["pending"] = True
+        root.after_idle(load_next_page)
+
+def listing_footer(summary):
+    """Summary lines shown under the full listing"""
+    return [f"\n📊 Total students: {summary['count']}", f"📈 Class Average: {summary['mean']:.2f}%"]
+
+def show_all(result):
+    """Render the full roster listing from a (students, stats summary) pair"""
+    students, summary = result
+    update_stats_panel(summary)
+    if students is None:
+        show_custom_message("File missing", f"'{FILE}' not found.", "error")
     if not students:
         set_output("No student records found.")
         return
     
-    key = custom_askstring("Find student", "Enter student number or name:")
-    if not key:
+    # Records are paged in as needed and marked for in-place edits
+    show_records(students, footer=listing_footer(summary), tracked=True)
+
+def update_stats_panel(summary):
+    """Show the running class statistics under the header"""
+    if not summary or not summary["count"]:
+        stats_lbl.config(text="No students yet")
         return
+    grades = "  ".join(f"{g}: {n}" for g, n in summary["grades"].items())
+    stats_lbl.config(text=f"👥 {summary['count']}   Mean {summary['mean']:.2f}%   "
+                          f"Median {summary['median']:.2f}%   Std dev {summary['stdev']:.2f}%"
+                          f"   |   {grades}")
+
+def view_all():
+    """Display all student records with class average"""
+    # Load and average on the worker thread
+    run_in_background(summarise_students, show_all)
+
+def view_individual():
+    """Find and display a specific student's record"""
+    def ask(count, _):
+        if not count:
+            set_output("No student records found.")
+            return
+        
+        key = custom_askstring("Find student", "Enter student number or name:")
+        if not key:
+            return
+        
+        # Search for matching student via the code/name index, on the worker
+        run_in_background(find_student, show, key)
     
-    # Search for matching student
-    keyl = key.strip().lower()
-    for s in students:
-        if keyl == s["code"].lower() or keyl in s["name"].lower():
+    def show(s):
+        if s is not None:
             set_output(format_student(s, show_header=True))
             return
+        
+        show_custom_message("Not found", "No matching student found.")
     
-    show_custom_message("Not found", "No matching student found.")
+    with_students(ask)
 
 def highest_score():
     """Display student with highest percentage"""
-    students = load_data()
-    if not students:
-        set_output("No student records found.")
-        return
+    def show(count, best):
+        if not count:
+            set_output("No student records found.")
+            return
+        
+        set_output(format_student(best, show_header=True))
     
-    best = max(students, key=lambda x: x["percentage"])
-    set_output(format_student(best, show_header=True))
+    with_students(show, ranked_student, True)
 
 def lowest_score():
     """Display student with lowest percentage"""
-    students = load_data()
-    if not students:
-        set_output("No student records found.")
-        return
+    def show(count, worst):
+        if not count:
+            set_output("No student records found.")
+            return
+        
+        set_output(format_student(worst, show_header=True))
     
-    worst = min(students, key=lambda x: x["percentage"])
-    set_output(format_student(worst, show_header=True))
+    with_students(show, ranked_student, False)
 
 def sort_records():
     """Sort and display students by percentage"""
-    students = load_data()
-    if not students:
+    with_students(show_sort_dialog)
+
+def show_sort_dialog(count, _):
+    """Ask for a sort order, then list the students in it"""
+    if not count:
         set_output("No student records found.")
         return
     
-    # Create sort order selection dialog
-    dialog = tk.Toplevel(root)
-    dialog.title("Sort Order")
-    dialog.geometry("400x150")
-    dialog.resizable(False, False)
-    dialog.transient(root)
-    dialog.grab_set()
-    
-    # Set window icon
-    try:
-        dialog.iconbitmap("student_manager.ico")
-    except:
-        pass
-    
-    # Center dialog
-    dialog.update_idletasks()
-    x = root.winfo_x() + (root.winfo_width() - dialog.winfo_width()) // 2
-    y = root.winfo_y() + (root.winfo_height() - dialog.winfo_height()) // 2
-    dialog.geometry(f"+{x}+{y}")
-    
-    result = {"ascending": None}
-    
-    def set_ascending(value):
-        result["ascending"] = value
-        dialog.destroy()
-    
-    # Dialog content
-    tk.Label(dialog, text="Choose sort order:", font=("Segoe UI", 11), pady=15).pack()
-    
-    # Sort order buttons
-    btn_frame = tk.Frame(dialog)
-    btn_frame.pack(pady=10)
-    
-    ascending_btn = tk.Button(btn_frame, text="Ascending", command=lambda: set_ascending(True),
-                             bg="#007acc", fg="white", font=("Segoe UI", 10), width=10, padx=10)
-    ascending_btn.pack(side="left", padx=10)
-    
-    descending_btn = tk.Button(btn_frame, text="Descending", command=lambda: set_ascending(False),
-                              bg="#666", fg="white", font=("Segoe UI", 10), width=10, padx=10)
-    descending_btn.pack(side="left", padx=10)
-    
-    root.wait_window(dialog)
+    # Ask for the sort order with the pooled dialog
+    ascending = ask_sort_order()
     
     # Check if user made a selection
-    if result["ascending"] is None:
+    if ascending is None:
         return
     
-    # Sort and display records
-    students.sort(key=lambda x: x["percentage"], reverse=not result["ascending"])
-    out = ["Sorted Student Records:\n"]
-    for s in students:
-        out.append(format_student(s))
-    set_output("\n".join(out))
+    # Walk the maintained ranking on the worker instead of re-sorting the roster
+    run_in_background(ranked_students,
+                      lambda ordered: show_records(ordered, header="Sorted Student Records:\n"),
+                      ascending)
 
 def add_student():
     """Add a new student record"""
-    students = load_data()
-    
-    # Get student code
-    code = custom_askstring("Add student", "Student code (1000-9999):")
-    if not code:
-        return
-    
-    # Check for duplicate code
-    if any(s["code"] == code for s in students):
-        show_custom_message("Duplicate", "Student code already exists.", "error")
-        return
-    
-    # Get student name
-    name = custom_askstring("Add student", "Full name:")
-    if not name:
-        return
-    
-    try:
-        # Get coursework and exam marks
-        c1 = custom_askinteger("Add student", "Coursework mark 1:", minvalue=0, maxvalue=20)
-        c2 = custom_askinteger("Add student", "Coursework mark 2:", minvalue=0, maxvalue=20)
-        c3 = custom_askinteger("Add student", "Coursework mark 3:", minvalue=0, maxvalue=20)
-        exam = custom_askinteger("Add student", "Exam mark:", minvalue=0, maxvalue=100)
-    except Exception:
-        show_custom_message("Input error", "Invalid marks.", "error")
-        return
+    def ask(count, _):
+        # Get student code
+        code = custom_askstring("Add student", "Student code (1000-9999):")
+        if not code:
+            return
+        
+        # Check for duplicate code on the worker, then ask for the rest
+        run_in_background(code_taken, lambda taken: ask_details(code, taken), code)
     
-    if None in (c1, c2, c3, exam):
-        return
+    def ask_details(code, taken):
+        if taken:
+            show_custom_message("Duplicate", "Student code already exists.", "error")
+            return
+        
+        # Get student name
+        name = custom_askstring("Add student", "Full name:")
+        if not name:
+            return
+        
+        try:
+            # Get coursework and exam marks
+            c1 = custom_askinteger("Add student", "Coursework mark 1:", minvalue=0, maxvalue=20)
+            c2 = custom_askinteger("Add student", "Coursework mark 2:", minvalue=0, maxvalue=20)
+            c3 = custom_askinteger("Add student", "Coursework mark 3:", minvalue=0, maxvalue=20)
+            exam = custom_askinteger("Add student", "Exam mark:", minvalue=0, maxvalue=100)
+        except Exception:
+            show_custom_message("Input error", "Invalid marks.", "error")
+            return
+        
+        if None in (c1, c2, c3, exam):
+            return
+        
+        # Calculate totals and grade
+        new = make_record(code, name, c1, c2, c3, exam)
+        
+        # Save new student (journalled, no full rewrite)
+        commit_edit(add_new_student, new, "Added", "Student record added.", added=[new])
     
-    # Calculate totals and grade
-    coursework_total = c1 + c2 + c3
-    total = coursework_total + exam
-    pct = (total / 160) * 100
-    new = {
-        "code": code, "name": name,
-        "c1": c1, "c2": c2, "c3": c3,
-        "coursework": coursework_total, "exam": exam,
-        "total": total, "percentage": pct, "grade": calc_grade(pct)
-    }
-    
-    # Save new student
-    students.append(new)
-    save_data(students)
-    show_custom_message("Added", "Student record added.")
-    view_all()
+    with_students(ask)
 
 def delete_student():
     """Remove a student record"""
-    students = load_data()
-    if not students:
-        set_output("No student records found.")
-        return
-    
-    key = custom_askstring("Delete student", "Enter student number or name:")
-    if not key:
-        return
-    
-    # Find and confirm deletion
-    keyl = key.strip().lower()
-    for i, s in enumerate(students):
-        if keyl == s["code"].lower() or keyl in s["name"].lower():
-            confirm = ask_custom_yesno("Confirm delete", f"Delete {s['name']} ({s['code']})?")
-            if confirm:
-                students.pop(i)
-                save_data(students)
-                show_custom_message("Deleted", "Student removed.")
-                view_all()
+    def ask(count, _):
+        if not count:
+            set_output("No student records found.")
+            return
+        
+        key = custom_askstring("Delete student", "Enter student number or name:")
+        if not key:
             return
+        run_in_background(find_student, confirm, key)
+    
+    def confirm(s):
+        # Confirm deletion of the student found
+        if s is not None:
+            if ask_custom_yesno("Confirm delete", f"Delete {s['name']} ({s['code']})?"):
+                commit_edit(delete_existing_student, s["code"], "Deleted", "Student removed.",
+                            deleted=[s["code"]])
+            return
+        
+        show_custom_message("Not found", "No matching student found.")
     
-    show_custom_message("Not found", "No matching student found.")
+    with_students(ask)
 
 def update_student():
     """Update an existing student record"""
-    students = load_data()
-    if not students:
-        set_output("No student records found.")
-        return
-    
-    key = custom_askstring("Update student", "Enter student number or name:")
-    if not key:
-        return
+    def ask(count, _):
+        if not count:
+            set_output("No student records found.")
+            return
+        
+        key = custom_askstring("Update student", "Enter student number or name:")
+        if not key:
+            return
+        
+        # Find student to update via the code/name index, on the worker
+        run_in_background(find_student, edit, key)
     
-    # Find student to update
-    keyl = key.strip().lower()
-    for s in students:
-        if keyl == s["code"].lower() or keyl in s["name"].lower():
+    def edit(s):
+        if s is not None:
             choice = custom_askstring("Update", "Which field to update? (name / c1 / c2 / c3 / exam)")
             if not choice:
                 return
@@ -508,6 +837,7 @@ def update_student():
                 show_custom_message("Invalid", "Field not recognised.", "error")
                 return
             
+            # s is the worker's copy; the edit job swaps it into the store
             # Update name field
             if choice == "name":
                 newv = custom_askstring("Update", "Enter new full name:")
@@ -529,30 +859,213 @@ def update_student():
                 s[choice] = newv
             
             # Recalculate totals and grade
-            s["coursework"] = s["c1"] + s["c2"] + s["c3"]
-            s["total"] = s["coursework"] + s["exam"]
-            s["percentage"] = (s["total"] / 160) * 100
-            s["grade"] = calc_grade(s["percentage"])
+            recalc_record(s)
             
-            save_data(students)
-            show_custom_message("Updated", "Student record updated.")
-            view_all()
+            commit_edit(update_existing_student, s, "Updated", "Student record updated.",
+                        updated=[s])
             return
+        
+        show_custom_message("Not found", "No matching student found.")
     
-    show_custom_message("Not found", "No matching student found.")
+    with_students(ask)
 
-# ---------- GUI setup ----------
-root = tk.Tk()
-root.title("Student Manager")
-root.geometry("1080x620")
-root.minsize(960, 560)
+def import_students():
+    """Bulk-import students from a CSV file"""
+    with watchdog.untimed():
+        path = filedialog.askopenfilename(title="Import students",
+                                          filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+    if not path:
+        return
+    
+    def import_all():
+        load_data()
+        return import_csv(path, store)
+    
+    def done(report):
+        show_custom_message("Import finished", report.summary("Imported"))
+        view_all()
+    
+    # Stream the file on the worker so large imports don't freeze the window
+    run_in_background(import_all, done)
+
+def export_students():
+    """Export the roster, optionally sorted, to a CSV file"""
+    def ask(count, _):
+        if not count:
+            set_output("No student records found.")
+            return
+        
+        order = custom_askstring("Export", "Order? (file / ascending / descending)")
+        if not order:
+            return
+        order = order.strip().lower()
+        if order not in ("file", "ascending", "descending"):
+            show_custom_message("Invalid", "Order not recognised.", "error")
+            return
+        
+        with watchdog.untimed():
+            path = filedialog.asksaveasfilename(title="Export students", defaultextension=".csv",
+                                                filetypes=[("CSV files", "*.csv")])
+        if not path:
+            return
+        
+        # The ranking is walked by the export job itself, on the worker
+        run_in_background(export_in_order, lambda report: show_custom_message(
+            "Export finished", report.summary("Exported")), path, order)
+    
+    with_students(ask)
+
+def generate_all_reports():
+    """Write every student's formatted report to one text file"""
+    def ask(count, _):
+        if not count:
+            set_output("No student records found.")
+            return
+        
+        with watchdog.untimed():
+            path = filedialog.asksaveasfilename(title="Save reports", defaultextension=".txt",
+                                                filetypes=[("Text files", "*.txt")])
+        if not path:
+            return
+        
+        def progress(done, total):
+            busy["note"] = f"⏳ Reports {done}/{total}"
+        
+        def done(report):
+            show_custom_message("Reports written", report.summary("Wrote reports for"))
+        
+        # Chunks are formatted across a process pool, then merged in order
+        run_in_background(write_all_reports, done, path, progress)
+    
+    with_students(ask)
 
-# Set application icon
-try:
-    root.iconbitmap("student_manager.ico")
-except:
-    print("Icon file 'student_manager.ico' not found. Using default icon.")
+# ---------- Batch entry / bulk edit ----------
+# Most existing students loaded into the batch grid at once
+BATCH_EDIT_LIMIT = 200
+# Blank rows offered for new students
+BATCH_BLANK_ROWS = 5
+BATCH_FIELDS = [("Code", 8), ("Full name", 28), ("C1", 5), ("C2", 5), ("C3", 5), ("Exam", 6)]
+
+def batch_entry():
+    """Enter new students and edit existing ones in one grid, saved together"""
+    def ask(count, _):
+        key = custom_askstring("Batch entry",
+                               "Students to edit (name or code), or leave blank to only add new ones:")
+        if key is None:
+            return
+        if key.strip() and count:
+            run_in_background(find_students, show_batch_form, key, BATCH_EDIT_LIMIT)
+        else:
+            show_batch_form([])
+    
+    with_students(ask)
+
+def show_batch_form(existing):
+    """Grid of entry rows: existing students first, then blank rows for new ones"""
+    form = tk.Toplevel(root)
+    form.title("Batch Entry")
+    form.geometry("720x480")
+    form.transient(root)
+    form.grab_set()
+    set_dialog_icon(form)
+    
+    tk.Label(form, text="Edit marks in place or fill blank rows, then save everything at once.",
+             font=("Segoe UI", 10), pady=10).pack()
+    
+    # Scrollable grid: a frame inside a canvas
+    grid_frame = tk.Frame(form)
+    grid_frame.pack(fill="both", expand=True, padx=10)
+    grid_canvas = tk.Canvas(grid_frame, highlightthickness=0)
+    grid_scroll = tk.Scrollbar(grid_frame, command=grid_canvas.yview)
+    grid_canvas.config(yscrollcommand=grid_scroll.set)
+    grid_scroll.pack(side="right", fill="y")
+    grid_canvas.pack(side="left", fill="both", expand=True)
+    grid = tk.Frame(grid_canvas)
+    grid_canvas.create_window(0, 0, window=grid, anchor="nw")
+    grid.bind("<Configure>", lambda e: grid_canvas.config(scrollregion=grid_canvas.bbox("all")))
+    
+    for col, (heading, width) in enumerate(BATCH_FIELDS):
+        tk.Label(grid, text=heading, font=("Segoe UI", 9, "bold")).grid(row=0, column=col, padx=2)
+    
+    rows = []  # (entries, original values or None for a new row)
+    
+    def add_row(values=None):
+        r = len(rows) + 1
+        entries = []
+        for col, (_, width) in enumerate(BATCH_FIELDS):
+            e = tk.Entry(grid, width=width, font=("Segoe UI", 10))
+            e.grid(row=r, column=col, padx=2, pady=1)
+            if values is not None:
+                e.insert(0, values[col])
+            entries.append(e)
+        if values is not None:
+            # Codes identify existing students, so they can't be edited here
+            entries[0].config(state="readonly")
+        rows.append((entries, values))
+    
+    for s in existing:
+        add_row([s["code"], s["name"], str(s["c1"]), str(s["c2"]), str(s["c3"]), str(s["exam"])])
+    for _ in range(BATCH_BLANK_ROWS):
+        add_row()
+    
+    def save():
+        if save_btn.cget("state") == "disabled":
+            return  # already being checked and saved
+        batch = []
+        for row_no, (entries, original) in enumerate(rows, start=1):
+            values = [e.get().strip() for e in entries]
+            for e in entries:
+                e.config(bg="white", readonlybackground="#eeeeee")
+            if original is None and not any(values):
+                continue  # unused blank row
+            if original is not None and values == original:
+                continue  # unchanged
+            batch.append((row_no, values, original is not None))
+        
+        def apply():
+            # Checked and saved in one job, so no other edit can land in between
+            load_data()
+            added, updated, errors = validate_batch(batch, store)
+            if errors or not (added or updated):
+                return added, updated, errors, None
+            # One journal write / transaction and one refresh for the whole batch
+            store.apply_batch(added, updated)
+            return added, updated, errors, edit_summary()
+        
+        def done(result):
+            added, updated, errors, summary = result
+            if errors:
+                if not form.winfo_exists():
+                    return  # closed while the rows were being checked
+                save_btn.config(state="normal")
+                # Highlight every bad row and list the first few problems
+                for row_no, _ in errors:
+                    for e in rows[row_no - 1][0]:
+                        e.config(bg="#ffd6d6", readonlybackground="#ffd6d6")
+                details = "\n".join(f"Row {row_no}: {reason}" for row_no, reason in errors[:5])
+                show_custom_message("Fix these rows", f"{len(errors)} rows need fixing.\n{details}", "error")
+                form.grab_set()
+                return
+            if form.winfo_exists():
+                form.destroy()
+            if summary is not None:
+                finish_edit("Saved", f"{len(added)} students added, {len(updated)} updated.",
+                            summary, added, updated)
+        
+        save_btn.config(state="disabled")
+        run_in_background(apply, done)
+    
+    btn_frame = tk.Frame(form)
+    btn_frame.pack(pady=10)
+    tk.Button(btn_frame, text="Add Row", command=add_row,
+              bg="#666", fg="white", font=("Segoe UI", 10), width=10).pack(side="left", padx=5)
+    save_btn = tk.Button(btn_frame, text="Save All", command=save,
+                         bg="#007acc", fg="white", font=("Segoe UI", 10), width=10)
+    save_btn.pack(side="left", padx=5)
+    tk.Button(btn_frame, text="Cancel", command=form.destroy,
+              bg="#666", fg="white", font=("Segoe UI", 10), width=10).pack(side="left", padx=5)
 
+# ---------- Sidebar navigation buttons ----------
 # Color scheme for modern appearance
 sidebar_bg = "#1e1e1e"
 btn_bg = "#333333"
@@ -561,56 +1074,6 @@ text_color = "#f5f5f5"
 content_bg = "#f4f4f4"
 border_color = "#c4c4c4"
 
-# Font definitions
-title_font = font.Font(family="Segoe UI", size=15, weight="bold")
-btn_font = font.Font(family="Segoe UI", size=10)
-text_font = font.Font(family="Consolas", size=11)
-
-# ---------- Main layout frames ----------
-sidebar = tk.Frame(root, bg=sidebar_bg, width=250)
-sidebar.pack(side="left", fill="y")
-content = tk.Frame(root, bg=content_bg)
-content.pack(side="right", fill="both", expand=True)
-
-# Header section
-header = tk.Frame(content, bg=content_bg)
-header.pack(fill="x", pady=(15, 8))
-title_lbl = tk.Label(header, text="Grades", bg=content_bg, fg="#111", font=title_font)
-title_lbl.pack(anchor="w", padx=20)
-subtitle = tk.Label(header, text="Manage coursework and exam scores", bg=content_bg, fg="#555")
-subtitle.pack(anchor="w", padx=20)
-
-# Main output text area
-out_frame = tk.Frame(content, bg="#ffffff", bd=1, relief="solid", highlightbackground="#e0e0e0", highlightthickness=1)
-out_frame.pack(fill="both", expand=True, padx=20, pady=(0,20))
-output_text = tk.Text(out_frame, font=text_font, wrap="word", state="disabled", bd=0, padx=15, pady=15, 
-                     bg="#fafafa", fg="#333333", selectbackground="#e3f2fd")
-output_text.pack(side="left", fill="both", expand=True)
-scroll = tk.Scrollbar(out_frame, command=output_text.yview, bg="#e0e0e0", troughcolor="#f5f5f5")
-scroll.pack(side="right", fill="y")
-output_text.config(yscrollcommand=scroll.set)
-
-# ---------- Sidebar logo ----------
-logo_frame = tk.Frame(sidebar, bg=sidebar_bg)
-logo_frame.pack(pady=20,padx=20)
-
-# Try to load logo image
-try:
-    img = Image.open("logo.png")
-    img = img.resize((50, 50))
-    logo_img = ImageTk.PhotoImage(img)
-    logo_lbl = tk.Label(logo_frame, image=logo_img, bg=sidebar_bg)
-    logo_lbl.image = logo_img
-    logo_lbl.pack(side="left", padx=10)
-except:
-    # Fallback text if logo not found
-    logo_lbl = tk.Label(logo_frame, text="LOGO", bg=sidebar_bg, fg=text_color, font=("Segoe UI", 12, "bold"))
-    logo_lbl.pack(side="left", padx=10)
-
-appname = tk.Label(logo_frame, text="Student\nManager", bg=sidebar_bg, fg=text_color, font=("Segoe UI", 16, "bold"))
-appname.pack(side="left")
-
-# ---------- Sidebar navigation buttons ----------
 def make_sidebar_button(parent, text, command):
     """Create styled sidebar button with hover effects"""
     b = tk.Button(parent, text=text, command=command, bg=btn_bg, fg=text_color,
@@ -621,28 +1084,125 @@ def make_sidebar_button(parent, text, command):
     b.bind("<Leave>", lambda e: b.config(bg=btn_bg))
     return b
 
-# Create all sidebar buttons
-make_sidebar_button(sidebar, "View All Students", view_all)
-make_sidebar_button(sidebar, "View Individual", view_individual)
-make_sidebar_button(sidebar, "Highest Score", highest_score)
-make_sidebar_button(sidebar, "Lowest Score", lowest_score)
-tk.Frame(sidebar, bg="#555", height=1).pack(fill="x", padx=18, pady=10)
-make_sidebar_button(sidebar, "Sort Records", sort_records)
-make_sidebar_button(sidebar, "Add Student", add_student)
-make_sidebar_button(sidebar, "Delete Student", delete_student)
-make_sidebar_button(sidebar, "Update Student", update_student)
-
-# ---------- Display welcome message ----------
-set_output(
-    "🎓 Welcome to Student Manager!\n\n"
-    "✨ Use the left menu to select an option.\n"
-    "📊 All student records will appear here.\n\n"
-    "💡 Features:\n"
-    "   • View all students or individual records\n"
-    "   • Find highest and lowest scores\n" 
-    "   • Sort records by percentage\n"
-    "   • Add, update, or delete students\n"
-)
-
-# Start the application
-root.mainloop()
+# ---------- GUI setup ----------
+def main():
+    """Build the window and start the app"""
+    global tk, filedialog, root, btn_font, output_text, scroll, status_lbl, stats_lbl, watchdog
+    import tkinter as tk
+    from tkinter import font, filedialog
+
+    # Opt-in profiling (PORTFOLIO_PROFILE=1 or --profile); times every callback,
+    # including load_data and friends on the worker thread
+    profiler = profiler_from_env("student_manager")
+    if profiler:
+        profiler.instrument_module(globals())
+
+    root = tk.Tk()
+    root.title("Student Manager")
+    root.geometry("1080x840")
+    root.minsize(960, 800)
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    # The result poll runs through this, so a stalled loop shows up in the log
+    watchdog = LoopWatchdog(root)
+
+    # Set application icon
+    try:
+        root.iconbitmap("student_manager.ico")
+    except:
+        print("Icon file 'student_manager.ico' not found. Using default icon.")
+
+    # Font definitions
+    title_font = font.Font(family="Segoe UI", size=15, weight="bold")
+    btn_font = font.Font(family="Segoe UI", size=10)
+    text_font = font.Font(family="Consolas", size=11)
+
+    # ---------- Main layout frames ----------
+    sidebar = tk.Frame(root, bg=sidebar_bg, width=250)
+    sidebar.pack(side="left", fill="y")
+    content = tk.Frame(root, bg=content_bg)
+    content.pack(side="right", fill="both", expand=True)
+
+    # Header section
+    header = tk.Frame(content, bg=content_bg)
+    header.pack(fill="x", pady=(15, 8))
+    title_lbl = tk.Label(header, text="Grades", bg=content_bg, fg="#111", font=title_font)
+    title_lbl.pack(anchor="w", padx=20)
+    subtitle = tk.Label(header, text="Manage coursework and exam scores", bg=content_bg, fg="#555")
+    subtitle.pack(anchor="w", padx=20)
+    status_lbl = tk.Label(header, text="", bg=content_bg, fg="#007acc")
+    status_lbl.pack(anchor="w", padx=20)
+    # Live class statistics, refreshed after every load and edit
+    stats_lbl = tk.Label(header, text="", bg=content_bg, fg="#333", font=("Segoe UI", 10, "bold"))
+    stats_lbl.pack(anchor="w", padx=20)
+
+    # Main output text area
+    out_frame = tk.Frame(content, bg="#ffffff", bd=1, relief="solid", highlightbackground="#e0e0e0", highlightthickness=1)
+    out_frame.pack(fill="both", expand=True, padx=20, pady=(0,20))
+    output_text = tk.Text(out_frame, font=text_font, wrap="word", state="disabled", bd=0, padx=15, pady=15, 
+                         bg="#fafafa", fg="#333333", selectbackground="#e3f2fd")
+    output_text.pack(side="left", fill="both", expand=True)
+    scroll = tk.Scrollbar(out_frame, command=output_text.yview, bg="#e0e0e0", troughcolor="#f5f5f5")
+    scroll.pack(side="right", fill="y")
+    output_text.config(yscrollcommand=on_output_scroll)
+
+    # ---------- Sidebar logo ----------
+    logo_frame = tk.Frame(sidebar, bg=sidebar_bg)
+    logo_frame.pack(pady=20,padx=20)
+
+    # Try to load logo image
+    try:
+        logo_img = load_photo("logo.png", (50, 50))
+        logo_lbl = tk.Label(logo_frame, image=logo_img, bg=sidebar_bg)
+        logo_lbl.image = logo_img
+        logo_lbl.pack(side="left", padx=10)
+    except:
+        # Fallback text if logo not found
+        logo_lbl = tk.Label(logo_frame, text="LOGO", bg=sidebar_bg, fg=text_color, font=("Segoe UI", 12, "bold"))
+        logo_lbl.pack(side="left", padx=10)
+
+    appname = tk.Label(logo_frame, text="Student\nManager", bg=sidebar_bg, fg=text_color, font=("Segoe UI", 16, "bold"))
+    appname.pack(side="left")
+
+    # ---------- Sidebar navigation buttons ----------
+    # Create all sidebar buttons
+    make_sidebar_button(sidebar, "View All Students", view_all)
+    make_sidebar_button(sidebar, "View Individual", view_individual)
+    make_sidebar_button(sidebar, "Highest Score", highest_score)
+    make_sidebar_button(sidebar, "Lowest Score", lowest_score)
+    tk.Frame(sidebar, bg="#555", height=1).pack(fill="x", padx=18, pady=10)
+    make_sidebar_button(sidebar, "Sort Records", sort_records)
+    make_sidebar_button(sidebar, "Add Student", add_student)
+    make_sidebar_button(sidebar, "Delete Student", delete_student)
+    make_sidebar_button(sidebar, "Update Student", update_student)
+    make_sidebar_button(sidebar, "Batch Entry", batch_entry)
+    tk.Frame(sidebar, bg="#555", height=1).pack(fill="x", padx=18, pady=10)
+    make_sidebar_button(sidebar, "Import CSV", import_students)
+    make_sidebar_button(sidebar, "Export CSV", export_students)
+    make_sidebar_button(sidebar, "Generate Reports", generate_all_reports)
+
+    # ---------- Display welcome message ----------
+    set_output(
+        "🎓 Welcome to Student Manager!\n\n"
+        "✨ Use the left menu to select an option.\n"
+        "📊 All student records will appear here.\n\n"
+        "💡 Features:\n"
+        "   • View all students or individual records\n"
+        "   • Find highest and lowest scores\n" 
+        "   • Sort records by percentage\n"
+        "   • Add, update, or delete students\n"
+    )
+
+    # Start delivering background results, then the application
+    watchdog.after(POLL_MS, poll_results)
+    run_in_background(summarise_students, lambda result: update_stats_panel(result[1]))
+    # Queued behind the first listing's data so it doesn't delay it
+    run_in_background(warm_store, lambda _: None)
+    if profiler:
+        profiler.watch_loop(root)
+    root.mainloop()
+    watchdog.close()
+    if profiler:
+        profiler.finish()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""Headless logic shared by the three Tk apps in the skills portfolio.
+
+Nothing in this package imports tkinter, PIL or pygame, so it can be used in
+batch jobs, benchmarks and on servers without a display. Import the module you
+need (e.g. ``portfolio_core.quiz``); this file deliberately imports nothing.
+"""
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+
+# Resized copies of images live here; override for kiosks with a fixed cache location
+CACHE_ENV_VAR = "PORTFOLIO_ASSET_CACHE"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "portfolio_assets")
+
+# Source digests already computed this run, keyed on (path, mtime, size)
+_digests = {}
+
+def cache_dir():
+    path = os.environ.get(CACHE_ENV_VAR) or DEFAULT_CACHE_DIR
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def source_digest(path):
+    """SHA-1 of the source file's bytes, so an edited asset gets new cache entries"""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    digest = _digests.get(key)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        _digests[key] = digest
+    return digest
+
+def image_format():
+    """PNG where Tk can read it (8.6+), PPM otherwise"""
+    import tkinter
+    return "png" if tkinter.TkVersion >= 8.6 else "ppm"
+
+def cached_image_path(path, size, frame=None):
+    """Cache file for path resized to size (and, for animations, one frame)"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    width, height = size
+    suffix = f"-{frame}" if frame is not None else ""
+    return os.path.join(cache_dir(), f"{stem}-{source_digest(path)[:16]}-{width}x{height}"
+                                     f"{suffix}.{image_format()}")
+
+def save_to_cache(image, cache_path):
+    """Write a PIL image into the cache atomically"""
+    fmt = image_format()
+    if fmt == "ppm":
+        image = image.convert("RGB")  # PPM has no alpha channel
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    image.save(tmp_path, format=fmt.upper())
+    os.replace(tmp_path, cache_path)
+
+def load_photo(path, size, master=None):
+    """tk.PhotoImage of path at size, resized once and then read from the cache
+
+    Warm starts hand the cached file straight to Tk; PIL is only imported to
+    build a missing cache entry.
+    """
+    import tkinter
+    cache_path = cached_image_path(path, size)
+    if not os.path.exists(cache_path):
+        from PIL import Image
+        with Image.open(path) as image:
+            save_to_cache(image.resize(size), cache_path)
+    return tkinter.PhotoImage(master=master, file=cache_path)
+
+# ---------- Animated GIFs ----------
+# Each frame is cached as its own image, plus a manifest of frame durations so
+# a warm start can play the animation without opening the GIF at all
+def gif_manifest_path(path, size):
+    width, height = size
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir(), f"{stem}-{source_digest(path)[:16]}-{width}x{height}.json")
+
+def load_gif_manifest(path, size):
+    """[(frame cache path, duration ms), ...] if every frame is cached, else None"""
+    try:
+        with open(gif_manifest_path(path, size), "r", encoding="utf-8") as f:
+            durations = json.load(f)["durations"]
+    except (OSError, ValueError, KeyError):
+        return None
+    frames = [(cached_image_path(path, size, i), d) for i, d in enumerate(durations)]
+    if not all(os.path.exists(frame) for frame, _ in frames):
+        return None
+    return frames
+
+def save_gif_manifest(path, size, durations):
+    """Record the frame durations once every frame has been cached"""
+    manifest_path = gif_manifest_path(path, size)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"source": os.path.basename(path), "durations": durations}, f)
+    os.replace(tmp_path, manifest_path)
@@ -0,0 +1,327 @@
+import argparse
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
+from array import array
+from collections import deque
+from operator import add
+
+# Every sound is converted to this format once, when it is loaded
+MIX_RATE = 44100
+MIX_CHANNELS = 2
+# Samples mixed per block by the software mixer (~5.8 ms)
+BLOCK_FRAMES = 256
+# Keep this much mixed audio queued ahead of the device; more is smoother,
+# less is snappier
+MIX_AHEAD_MS = 30
+# Sounds that can play over each other
+VOICES = 8
+# Force a backend: pygame, pipe, winsound or null
+BACKEND_ENV_VAR = "PORTFOLIO_AUDIO"
+# Latencies kept for the percentile in the report
+LATENCY_SAMPLES = 1000
+
+# ---------- Decoding ----------
+def decode_wav(path):
+    """Read a WAV into 16-bit interleaved samples at MIX_RATE / MIX_CHANNELS"""
+    with wave.open(path, "rb") as w:
+        rate, width, channels = w.getframerate(), w.getsampwidth(), w.getnchannels()
+        data = w.readframes(w.getnframes())
+
+    if width == 1:
+        # 8-bit WAVs are unsigned
+        samples = array("h", ((b - 128) << 8 for b in data))
+    elif width == 2:
+        samples = array("h", data)
+        if sys.byteorder == "big":
+            samples.byteswap()
+    else:
+        raise ValueError(f"'{path}': {width * 8}-bit audio is not supported")
+
+    if channels == 1 and MIX_CHANNELS == 2:
+        stereo = array("h", bytes(len(samples) * 4))
+        stereo[0::2] = samples
+        stereo[1::2] = samples
+        samples = stereo
+    elif channels != MIX_CHANNELS:
+        raise ValueError(f"'{path}': {channels}-channel audio is not supported")
+
+    if rate != MIX_RATE:
+        # Nearest-sample resampling; the effects are short and this runs once
+        frames = len(samples) // MIX_CHANNELS
+        out_frames = frames * MIX_RATE // rate
+        resampled = array("h")
+        for i in range(out_frames):
+            j = (i * rate // MIX_RATE) * MIX_CHANNELS
+            resampled.extend(samples[j:j + MIX_CHANNELS])
+        samples = resampled
+    return samples
+
+def mix_into(block, samples):
+    """Add samples onto block in place, clipping to the 16-bit range"""
+    summed = list(map(add, block, samples))
+    if max(summed) > 32767 or min(summed) < -32768:
+        summed = [32767 if s > 32767 else -32768 if s < -32768 else s for s in summed]
+    block[:len(summed)] = array("h", summed)
+
+# ---------- Backends ----------
+class NullBackend:
+    """Plays nothing; for headless runs and machines without a sound device"""
+    name = "null"
+
+    def __init__(self, service):
+        self.service = service
+
+    def play(self, name, triggered):
+        self.service.played(triggered, 0.0)
+
+    def close(self):
+        pass
+
+class PipeBackend:
+    """Software mixer streaming raw PCM to pacat (PulseAudio/PipeWire) or aplay (ALSA)
+
+    A mixer thread sums every active voice into small blocks and writes them
+    paced to stay about MIX_AHEAD_MS ahead of the device, so a new effect is
+    heard within one block plus that margin, even while others are playing.
+    """
+    name = "pipe"
+
+    COMMANDS = (
+        ["pacat", "--playback", "--raw", "--format=s16le", f"--rate={MIX_RATE}",
+         f"--channels={MIX_CHANNELS}", "--latency-msec=20"],
+        ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-r", str(MIX_RATE),
+         "-c", str(MIX_CHANNELS), "--buffer-time=40000", "-"],
+    )
+
+    @classmethod
+    def available(cls):
+        return any(shutil.which(cmd[0]) for cmd in cls.COMMANDS)
+
+    def __init__(self, service):
+        self.service = service
+        command = next(cmd for cmd in self.COMMANDS if shutil.which(cmd[0]))
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.requests = queue.SimpleQueue()
+        self.running = True
+        self.thread = threading.Thread(target=self.mix_loop, daemon=True)
+        self.thread.start()
+
+    def play(self, name, triggered):
+        self.requests.put((self.service.sound(name), triggered))
+
+    def mix_loop(self):
+        voices = deque()  # [samples, position, trigger time or None once heard]
+        block_len = BLOCK_FRAMES * MIX_CHANNELS
+        silence = bytes(block_len * 2)
+        start = time.perf_counter()
+        written = 0  # frames handed to the device so far
+        while self.running:
+            # Wait until the device has played down to the look-ahead margin
+            ahead = written / MIX_RATE - (time.perf_counter() - start)
+            if ahead > MIX_AHEAD_MS / 1000:
+                time.sleep(ahead - MIX_AHEAD_MS / 1000)
+            while True:
+                try:
+                    samples, triggered = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                if len(voices) >= VOICES:
+                    voices.popleft()  # drop the oldest rather than queue behind it
+                voices.append([samples, 0, triggered])
+
+            block = array("h", silence)
+            for voice in voices:
+                samples, pos = voice[0], voice[1]
+                mix_into(block, samples[pos:pos + block_len])
+                voice[1] = pos + block_len
+            try:
+                self.process.stdin.write(block.tobytes())
+                self.process.stdin.flush()
+            except (BrokenPipeError, OSError, ValueError):
+                return  # player exited or we're closing
+
+            now = time.perf_counter()
+            # Audio already queued (behind this block) before it reaches the speaker
+            queued = max(0.0, written / MIX_RATE - (now - start))
+            written += BLOCK_FRAMES
+            for voice in voices:
+                if voice[2] is not None:
+                    self.service.played(voice[2], queued, now)
+                    voice[2] = None
+            if any(v[1] >= len(v[0]) for v in voices):
+                voices = deque(v for v in voices if v[1] < len(v[0]))
+
+    def close(self):
+        self.running = False
+        self.thread.join(timeout=1)
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.terminate()
+
+class PygameBackend:
+    """pygame.mixer channels, which mix in SDL's own audio thread"""
+    name = "pygame"
+
+    def __init__(self, service):
+        import pygame
+        self.mixer = pygame.mixer
+        if not self.mixer.get_init():
+            self.mixer.init(frequency=MIX_RATE, size=-16, channels=MIX_CHANNELS, buffer=512)
+        self.mixer.set_num_channels(max(VOICES, self.mixer.get_num_channels()))
+        freq, size, channels = self.mixer.get_init()
+        self.buffer_s = 512 / freq
+        # When the formats match, hand pygame our samples instead of the file
+        self.native = (freq, size, channels) == (MIX_RATE, -16, MIX_CHANNELS)
+        self.sounds = {}
+        self.service = service
+
+    def play(self, name, triggered):
+        sound = self.sounds.get(name)
+        if sound is None:
+            if self.native:
+                sound = self.mixer.Sound(buffer=self.service.sound(name).tobytes())
+            else:
+                sound = self.mixer.Sound(self.service.paths[name])
+            self.sounds[name] = sound
+        sound.play()
+        self.service.played(triggered, self.buffer_s)
+
+    def close(self):
+        pass
+
+class WinsoundBackend:
+    """Windows fallback without pygame: one sound at a time, no mixing"""
+    name = "winsound"
+
+    def __init__(self, service):
+        import winsound
+        self.winsound = winsound
+        self.service = service
+
+    def play(self, name, triggered):
+        # SND_MEMORY can't be combined with SND_ASYNC, so play from the file
+        self.winsound.PlaySound(self.service.paths[name], self.winsound.SND_FILENAME
+                                | self.winsound.SND_ASYNC | self.winsound.SND_NODEFAULT)
+        self.service.played(triggered, 0.0)
+
+    def close(self):
+        self.winsound.PlaySound(None, 0)
+
+BACKENDS = {"pygame": PygameBackend, "pipe": PipeBackend,
+            "winsound": WinsoundBackend, "null": NullBackend}
+
+def pick_backend():
+    """Backend named by PORTFOLIO_AUDIO, else the best one this machine has"""
+    name = os.environ.get(BACKEND_ENV_VAR)
+    if name:
+        if name not in BACKENDS:
+            raise ValueError(f"unknown audio backend {name!r}, expected one of {tuple(BACKENDS)}")
+        return BACKENDS[name]
+    try:
+        import pygame  # noqa: F401
+        return PygameBackend
+    except ImportError:
+        pass
+    if sys.platform.startswith("linux") and PipeBackend.available():
+        return PipeBackend
+    if sys.platform == "win32":
+        return WinsoundBackend
+    return NullBackend
+
+# ---------- Service ----------
+class AudioService:
+    """Named sound effects decoded once and played with measured latency
+
+    play() returns immediately; the backend reports when each sound actually
+    reaches the device, and latency_report() summarises trigger-to-play times.
+    With lazy=True nothing is opened or decoded up front: start() opens the
+    backend (from any thread) and each sound is decoded the first time it plays.
+    """
+
+    def __init__(self, paths, backend=None, lazy=False):
+        self.paths = dict(paths)
+        self.sounds = {}
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.lock = threading.Lock()
+        self.backend_class = backend
+        self.backend = None
+        self.start_lock = threading.Lock()
+        if not lazy:
+            for name in self.paths:
+                self.sound(name)
+            self.start()
+
+    def sound(self, name):
+        """Decoded samples for name, decoding the file on first use"""
+        samples = self.sounds.get(name)
+        if samples is None:
+            samples = self.sounds[name] = decode_wav(self.paths[name])
+        return samples
+
+    def start(self):
+        """Open the backend, if that hasn't happened yet"""
+        with self.start_lock:
+            if self.backend is None:
+                backend = self.backend_class or pick_backend()
+                try:
+                    self.backend = backend(self)
+                except Exception:
+                    # No usable device (or player binary); stay silent rather than crash
+                    self.backend = NullBackend(self)
+        return self.backend
+
+    def play(self, name):
+        triggered = time.perf_counter()
+        (self.backend or self.start()).play(name, triggered)
+
+    def played(self, triggered, queued, now=None):
+        """Backend callback: a sound triggered at triggered is now going out"""
+        now = time.perf_counter() if now is None else now
+        with self.lock:
+            self.latencies.append(now - triggered + queued)
+
+    def latency_report(self):
+        with self.lock:
+            samples = sorted(self.latencies)
+        backend = self.backend.name if self.backend else "not started"
+        if not samples:
+            return f"Audio ({backend}): no sounds played"
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return (f"Audio ({backend}): {len(samples)} sounds, trigger-to-play "
+                f"mean {sum(samples) / len(samples) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms, "
+                f"max {samples[-1] * 1000:.1f} ms")
+
+    def close(self):
+        if self.backend:
+            self.backend.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play WAV effects and measure trigger-to-play latency")
+    parser.add_argument("files", nargs="+", help="WAV files to load")
+    parser.add_argument("--backend", choices=tuple(BACKENDS), default=None)
+    parser.add_argument("--plays", type=int, default=20, help="triggers per file")
+    parser.add_argument("--gap-ms", type=float, default=50, help="time between triggers, so sounds overlap")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    service = AudioService({os.path.basename(f): f for f in args.files}, BACKENDS.get(args.backend))
+    print(f"Decoded {len(args.files)} files in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for _ in range(args.plays):
+        for name in service.paths:
+            service.play(name)
+            time.sleep(args.gap_ms / 1000)
+    time.sleep(0.2)  # let the last triggers reach the device
+    service.close()
+    print(service.latency_report())
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+import random
+
+JOKES_FILE = "randomJokes.txt"
+
+# Split a joke line at the first question mark into (setup, punchline)
+def parse_joke(line):
+    line = line.strip()
+    if "?" not in line:
+        return None
+    setup, punchline = line.split("?", 1)
+    return setup + "?", punchline
+
+# Load jokes from text file and split into setup/punchline pairs
+def load_jokes(path=JOKES_FILE):
+    jokes = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            joke = parse_joke(line)
+            if joke is not None:
+                jokes.append(joke)
+    return jokes
+
+# Pick a random (setup, punchline) pair
+def pick_joke(jokes, rng=random):
+    return rng.choice(jokes)
@@ -0,0 +1,165 @@
+import cProfile
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Set to 1 (or a .pstats path) to profile an app; the --profile[=PATH] flag does the same
+ENV_VAR = "PORTFOLIO_PROFILE"
+# Set to a number of seconds to also print the summary periodically
+EVERY_ENV_VAR = "PORTFOLIO_PROFILE_EVERY"
+# How often the event-loop lag probe asks to run
+LAG_PROBE_MS = 100
+
+class Profiler:
+    """Opt-in timings for one app's Tk callbacks, canvas churn and loop lag
+
+    Nothing here runs unless profiler_from_env() finds the env var or flag,
+    so the apps pay nothing by default.
+    """
+
+    def __init__(self, app, pstats_path=None, every=None):
+        self.app = app
+        self.pstats_path = pstats_path or f"{app}.pstats"
+        self.every = every
+        self.calls = {}  # name -> [count, total seconds, max seconds]
+        self.lock = threading.Lock()  # the student manager also calls from its worker
+        self.created = Counter()
+        self.deleted = 0
+        self.canvases = []
+        self.lag = [0, 0.0, 0.0]  # probes, total and worst seconds they ran late
+        self.milestones = []  # (name, seconds since the app started)
+        self.started = time.perf_counter()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def record(self, name, seconds):
+        with self.lock:
+            entry = self.calls.get(name)
+            if entry is None:
+                self.calls[name] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+    def milestone(self, name, seconds):
+        """Note a one-off startup point, like the first interactive frame"""
+        with self.lock:
+            self.milestones.append((name, seconds))
+
+    def wrap(self, name, func):
+        """func, timed under name on every call"""
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        return timed
+
+    def instrument_module(self, namespace, skip=("main",)):
+        """Time every function defined in a module, by rebinding its globals
+
+        Callbacks, lambdas and after() loops look functions up by name when
+        they run, so every later call goes through the timed wrapper.
+        """
+        module = namespace["__name__"]
+        for name, value in list(namespace.items()):
+            if name in skip or not callable(value) or isinstance(value, type):
+                continue
+            if getattr(value, "__module__", None) == module and hasattr(value, "__code__"):
+                namespace[name] = self.wrap(name, value)
+
+    def watch_canvas(self, canvas):
+        """Count items created and deleted on canvas, by item type
+
+        Call it before anything is drawn so the alive count starts from zero.
+        """
+        self.canvases.append(canvas)
+        for kind in ("arc", "bitmap", "image", "line", "oval", "polygon",
+                     "rectangle", "text", "window"):
+            method = getattr(canvas, f"create_{kind}")
+
+            def create(*args, _method=method, _kind=kind, **kwargs):
+                self.created[_kind] += 1
+                return _method(*args, **kwargs)
+            setattr(canvas, f"create_{kind}", create)
+
+        delete = canvas.delete
+
+        def counted_delete(*items):
+            # Tags can match several items, so count what actually goes
+            for item in items:
+                self.deleted += len(canvas.find_withtag(item))
+            return delete(*items)
+        canvas.delete = counted_delete
+
+    def watch_loop(self, root, interval_ms=LAG_PROBE_MS):
+        """Sample how late the Tk event loop runs a callback asked for in interval_ms"""
+        state = {"due": time.perf_counter() + interval_ms / 1000,
+                 "report_at": time.perf_counter() + (self.every or 0)}
+
+        def probe():
+            now = time.perf_counter()
+            late = max(0.0, now - state["due"])
+            self.lag[0] += 1
+            self.lag[1] += late
+            self.lag[2] = max(self.lag[2], late)
+            if self.every and now >= state["report_at"]:
+                print(self.report(), file=sys.stderr)
+                state["report_at"] = now + self.every
+            state["due"] = now + interval_ms / 1000
+            root.after(interval_ms, probe)
+        root.after(interval_ms, probe)
+
+    def report(self):
+        """Human-readable summary of everything measured so far"""
+        lines = [f"Profile for {self.app} ({time.perf_counter() - self.started:.1f}s)"]
+        with self.lock:
+            milestones = list(self.milestones)
+        for name, seconds in milestones:
+            lines.append(f"  {name}: {seconds * 1000:.1f} ms")
+        lines.append(f"  {'callback':<28} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}")
+        with self.lock:
+            calls = sorted(self.calls.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (count, total, longest) in calls:
+            lines.append(f"  {name:<28} {count:>7} {total * 1000:>10.1f} "
+                         f"{total / count * 1000:>9.2f} {longest * 1000:>9.2f}")
+
+        if self.canvases:
+            kinds = ", ".join(f"{kind} {n}" for kind, n in self.created.most_common())
+            created = sum(self.created.values())
+            # Worked out from the counters, since the window may be gone by now
+            lines.append(f"  Canvas items: created {created} ({kinds}), "
+                         f"deleted {self.deleted}, alive {created - self.deleted}")
+        probes, total, worst = self.lag
+        if probes:
+            lines.append(f"  Event-loop lag: {probes} probes, mean {total / probes * 1000:.1f} ms, "
+                         f"max {worst * 1000:.1f} ms")
+        return "\n".join(lines)
+
+    def finish(self):
+        """Stop profiling, write the pstats file and print the summary"""
+        self.profile.disable()
+        self.profile.dump_stats(self.pstats_path)
+        print(self.report(), file=sys.stderr)
+        print(f"  cProfile stats written to {os.path.abspath(self.pstats_path)} "
+              f"(python -m pstats {self.pstats_path})", file=sys.stderr)
+
+def profiler_from_env(app, argv=None):
+    """A Profiler if PORTFOLIO_PROFILE or --profile[=PATH] asks for one, else None"""
+    argv = sys.argv[1:] if argv is None else argv
+    setting = os.environ.get(ENV_VAR, "")
+    for arg in argv:
+        if arg == "--profile":
+            setting = setting or "1"
+        elif arg.startswith("--profile="):
+            setting = arg.split("=", 1)[1]
+    if setting in ("", "0"):
+        return None
+    every = os.environ.get(EVERY_ENV_VAR)
+    return Profiler(app, None if setting == "1" else setting, float(every) if every else None)
@@ -0,0 +1,46 @@
+import random
+
+QUESTIONS_PER_QUIZ = 10
+# Points for a correct answer on the first and second attempt
+FIRST_TRY_POINTS = 10
+SECOND_TRY_POINTS = 5
+
+# Smallest and largest operand for each difficulty
+DIFFICULTY_RANGES = {
+    "easy": (1, 9),
+    "moderate": (10, 99),
+    "advanced": (1000, 9999),
+}
+
+# Generate a random number based on difficulty
+def randomInt(d, rng=random):
+    lo, hi = DIFFICULTY_RANGES.get(d, DIFFICULTY_RANGES["advanced"])
+    return rng.randint(lo, hi)
+
+# Randomly choose + or - for the problem
+def decideOperation(rng=random):
+    return rng.choice(['+', '-'])
+
+# Build one problem as (num1, op, num2, answer)
+def make_problem(d, rng=random):
+    num1 = randomInt(d, rng)
+    num2 = randomInt(d, rng)
+    op = decideOperation(rng)
+    answer = num1 + num2 if op == '+' else num1 - num2
+    return num1, op, num2, answer
+
+# Score one attempt: returns (points earned, whether the question is over)
+def score_attempt(correct, attempt):
+    if correct:
+        return (FIRST_TRY_POINTS if attempt == 1 else SECOND_TRY_POINTS), True
+    # A wrong first attempt gets one more try
+    return 0, attempt >= 2
+
+# Calculate letter grade based on score
+def calculateGrade(s):
+    if s >= 90: return "A+ 🌟"
+    if s >= 80: return "A"
+    if s >= 70: return "B"
+    if s >= 60: return "C"
+    if s >= 50: return "D"
+    return "F ❌"
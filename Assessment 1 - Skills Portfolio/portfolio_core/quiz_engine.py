@@ -0,0 +1,144 @@
+import argparse
+import random
+import sys
+import time
+
+from .quiz import (DIFFICULTY_RANGES, QUESTIONS_PER_QUIZ, calculateGrade, make_problem,
+                   score_attempt)
+
+# NumPy is optional: batches and simulations vectorise with it, and fall back
+# to the random module (same results shape, slower) without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Points for a right answer on each attempt, taken from the quiz's own rule
+FIRST_TRY = score_attempt(True, 1)[0]
+SECOND_TRY = score_attempt(True, 2)[0]
+
+class QuizEngine:
+    """Quiz logic without Tk: batches of problems, scoring and simulation
+
+    Problems, scores and grades follow the same rules as the Tk quiz
+    (make_problem, score_attempt, calculateGrade); only the random draws are
+    batched. Pass a seed to get the same problems and simulations every run.
+    """
+
+    def __init__(self, difficulty="easy", seed=None, use_numpy=None):
+        if difficulty not in DIFFICULTY_RANGES:
+            raise ValueError(f"unknown difficulty {difficulty!r}, "
+                             f"expected one of {tuple(DIFFICULTY_RANGES)}")
+        self.difficulty = difficulty
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+        if self.use_numpy and np is None:
+            raise RuntimeError("use_numpy=True but NumPy is not installed")
+        if self.use_numpy:
+            self.rng = np.random.default_rng(seed)
+        else:
+            self.rng = random.Random(seed)
+
+    def problems(self, count):
+        """count problems as (num1, op, num2, answer), like make_problem()"""
+        if not self.use_numpy:
+            return [make_problem(self.difficulty, self.rng) for _ in range(count)]
+        lo, hi = DIFFICULTY_RANGES[self.difficulty]
+        nums = self.rng.integers(lo, hi + 1, size=(2, count))
+        plus = self.rng.integers(0, 2, size=count).astype(bool)
+        answers = np.where(plus, nums[0] + nums[1], nums[0] - nums[1])
+        return [(int(a), "+" if p else "-", int(b), int(ans))
+                for a, b, p, ans in zip(nums[0], nums[1], plus, answers)]
+
+    def worksheet(self, count=QUESTIONS_PER_QUIZ):
+        """Printable problem lines plus an answer key"""
+        problems = self.problems(count)
+        lines = [f"{i:>3}. {a} {op} {b} = ______" for i, (a, op, b, _) in enumerate(problems, 1)]
+        key = [f"{i:>3}. {answer}" for i, (*_, answer) in enumerate(problems, 1)]
+        return lines, key
+
+    @staticmethod
+    def score_session(problems, attempts):
+        """Score answers like checkAnswer: attempts[i] holds up to two answers for problem i
+
+        Returns (score, grade).
+        """
+        score = 0
+        for (_, _, _, answer), tries in zip(problems, attempts):
+            for attempt, value in enumerate(tries[:2], 1):
+                points, done = score_attempt(value == answer, attempt)
+                score += points
+                if done:
+                    break
+        return score, calculateGrade(score)
+
+    def simulate(self, sessions, p_first=0.8, p_second=0.5, questions=QUESTIONS_PER_QUIZ):
+        """Play sessions quizzes with a student who is right with p_first on the
+        first try and p_second on the retry
+
+        Returns a report with the grade counts, mean score and sessions/second.
+        """
+        start = time.perf_counter()
+        if self.use_numpy:
+            first = self.rng.random((sessions, questions)) < p_first
+            second = ~first & (self.rng.random((sessions, questions)) < p_second)
+            scores = (first * FIRST_TRY + second * SECOND_TRY).sum(axis=1)
+            counts = np.bincount(scores)
+            by_score = {s: int(n) for s, n in enumerate(counts) if n}
+        else:
+            by_score = {}
+            draw = self.rng.random
+            for _ in range(sessions):
+                score = 0
+                for _ in range(questions):
+                    if draw() < p_first:
+                        score += FIRST_TRY
+                    elif draw() < p_second:
+                        score += SECOND_TRY
+                by_score[score] = by_score.get(score, 0) + 1
+        seconds = time.perf_counter() - start
+
+        grades = {}
+        for score, n in sorted(by_score.items(), reverse=True):
+            grade = calculateGrade(score)
+            grades[grade] = grades.get(grade, 0) + n
+        return {
+            "sessions": sessions,
+            "mean_score": sum(s * n for s, n in by_score.items()) / sessions if sessions else 0.0,
+            "grades": grades,
+            "seconds": seconds,
+            "sessions_per_second": sessions / seconds if seconds else float("inf"),
+            "numpy": self.use_numpy,
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless maths quiz: worksheets and simulations")
+    parser.add_argument("--difficulty", choices=tuple(DIFFICULTY_RANGES), default="easy")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-numpy", action="store_true", help="use the random module even if NumPy is installed")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sheet = sub.add_parser("worksheet", help="print problems and an answer key")
+    sheet.add_argument("--count", type=int, default=QUESTIONS_PER_QUIZ)
+    sim = sub.add_parser("simulate", help="simulate many quiz sessions")
+    sim.add_argument("--sessions", type=int, default=1_000_000)
+    sim.add_argument("--p-first", type=float, default=0.8, help="chance of a right first answer")
+    sim.add_argument("--p-second", type=float, default=0.5, help="chance of a right retry")
+    args = parser.parse_args(argv)
+
+    engine = QuizEngine(args.difficulty, args.seed, use_numpy=False if args.no_numpy else None)
+    if args.command == "worksheet":
+        lines, key = engine.worksheet(args.count)
+        print("\n".join(lines))
+        print("\nAnswers")
+        print("\n".join(key))
+        return
+
+    report = engine.simulate(args.sessions, args.p_first, args.p_second)
+    print(f"{report['sessions']:,} sessions in {report['seconds']:.2f}s "
+          f"({report['sessions_per_second']:,.0f} sessions/s, "
+          f"{'NumPy' if report['numpy'] else 'random module'})")
+    print(f"Mean score: {report['mean_score']:.1f}/100")
+    for grade, n in report["grades"].items():
+        print(f"  {grade:<6} {n:>10,} {n / report['sessions'] * 100:6.2f}%")
+
+if __name__ == "__main__":
+    sys.exit(main())
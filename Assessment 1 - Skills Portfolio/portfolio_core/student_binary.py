@@ -0,0 +1,175 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+from collections import Counter
+from operator import add
+
+from .student_store import FILE, StudentStore, make_record
+
+# Default file used by the binary backend
+BIN_FILE = "studentMarks.bin"
+
+# Layout (little-endian):
+#   header   magic, format version, reserved, record count
+#   records  one fixed-width row per student: offset of its strings, code and
+#            name lengths in bytes, then c1, c2, c3 and exam as uint8
+#   strings  UTF-8 code immediately followed by name, for every student
+MAGIC = b"STMK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+RECORD = struct.Struct("<IHH4B")
+# Where the marks sit inside a RECORD, for reading whole columns at once
+MARKS_AT = 8
+
+def write_binary(path, students):
+    """Write students to path in the binary format"""
+    records = bytearray()
+    strings = []
+    offset = 0
+    for s in students:
+        code = s["code"].encode("utf-8")
+        name = s["name"].encode("utf-8")
+        try:
+            records += RECORD.pack(offset, len(code), len(name),
+                                   s["c1"], s["c2"], s["c3"], s["exam"])
+        except struct.error:
+            raise ValueError(f"student {s['code']}: marks must be 0-255 and "
+                             f"code/name under 64KB for the binary format")
+        strings.append(code)
+        strings.append(name)
+        offset += len(code) + len(name)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(records) // RECORD.size))
+        f.write(records)
+        f.writelines(strings)
+        f.flush()
+        os.fsync(f.fileno())
+
+class BinaryRoster:
+    """Read-only, memory-mapped view of a binary roster file
+
+    Behaves like a list of student records, but a record is only decoded
+    when it is indexed or iterated to, so opening even a multi-million row
+    file reads nothing beyond the header.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.count = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a binary roster file")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"'{path}' uses binary format version {version}, expected {VERSION}")
+        self.strings_at = HEADER.size + self.count * RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def record(self, i):
+        """Decode record i into the usual dict"""
+        offset, code_len, name_len, c1, c2, c3, exam = RECORD.unpack_from(
+            self.map, HEADER.size + i * RECORD.size)
+        start = self.strings_at + offset
+        code = self.map[start:start + code_len].decode("utf-8")
+        name = self.map[start + code_len:start + code_len + name_len].decode("utf-8")
+        return make_record(code, name, c1, c2, c3, exam)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.record(j) for j in range(*i.indices(self.count))]
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("roster index out of range")
+        return self.record(i)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.record(i)
+
+    def total_counts(self):
+        """(total, how many students) pairs, read straight from the mark bytes"""
+        table = self.map[HEADER.size:self.strings_at]
+        step = RECORD.size
+        c1, c2, c3, exam = (table[MARKS_AT + k::step] for k in range(4))
+        return Counter(map(add, map(add, c1, c2), map(add, c3, exam))).items()
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+class BinaryStudentStore(StudentStore):
+    """StudentStore over the binary format
+
+    load() maps the file and hands back a BinaryRoster, so listing and paging
+    never parse the rest of the file. Like the text store's columns, it is
+    swapped for a list of dicts by the first lookup, sort or edit; edits are
+    journalled as text exactly like the text store and compacted back to binary.
+    """
+
+    def __init__(self, path=BIN_FILE):
+        self._roster = None
+        super().__init__(path)
+
+    def close(self):
+        """Unmap the file; a snapshot still paging it will stop there"""
+        if self._roster is not None:
+            self._roster.close()
+            self._roster = None
+
+    def _read_data(self):
+        # The file changed, so the old map goes
+        self.close()
+        self._roster = BinaryRoster(self.path)
+        return self._roster
+
+    def _write_data(self, path, students):
+        write_binary(path, students)
+
+    def save(self, students):
+        if isinstance(students, BinaryRoster):
+            students = list(students)
+        # Windows can't replace a file that is still mapped
+        self.close()
+        super().save(students)
+
+# ---------- Converters ----------
+def text_to_binary(text_path=FILE, bin_path=BIN_FILE):
+    """Write every record (journal replayed) from the text file as binary"""
+    students = StudentStore(text_path).load()
+    BinaryStudentStore(bin_path).save(students)
+    return len(students)
+
+def binary_to_text(bin_path=BIN_FILE, text_path=FILE):
+    """Write every record (journal replayed) from the binary file as text"""
+    source = BinaryStudentStore(bin_path)
+    students = list(source.load())
+    source.close()
+    StudentStore(text_path).save(students)
+    return len(students)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert rosters between text and binary")
+    sub = parser.add_subparsers(dest="command", required=True)
+    to_binary = sub.add_parser("to-binary", help="convert studentMarks.txt to the binary format")
+    to_binary.add_argument("source", nargs="?", default=FILE)
+    to_binary.add_argument("target", nargs="?", default=BIN_FILE)
+    to_text = sub.add_parser("to-text", help="convert a binary roster back to text")
+    to_text.add_argument("source", nargs="?", default=BIN_FILE)
+    to_text.add_argument("target", nargs="?", default=FILE)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        parser.error(f"'{args.source}' not found")
+    convert = text_to_binary if args.command == "to-binary" else binary_to_text
+    count = convert(args.source, args.target)
+    print(f"Converted {count} students from {args.source} to {args.target}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+from array import array
+from collections import Counter
+from operator import add
+
+from .student_store import MAX_TOTAL, calc_grade, make_record, total_to_percentage
+
+# NumPy is optional: with it, totals, grades and aggregates run over zero-copy
+# views of the same arrays; without it they use C-level map() passes
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Grade for every possible total out of 160, so grading is one bytes.translate()
+GRADE_BY_TOTAL = bytes(ord(calc_grade(total_to_percentage(t))) for t in range(MAX_TOTAL + 1))
+GRADE_TABLE = GRADE_BY_TOTAL + b"?" * (256 - len(GRADE_BY_TOTAL))
+# 32-bit signed marks; a hand-edited file with anything bigger raises OverflowError
+MARK_TYPE = "i"
+MARK_MIN, MARK_MAX = -2**31, 2**31 - 1
+
+class StudentColumns:
+    """Array-backed roster: one column per field instead of one dict per student
+
+    Marks and totals are 32-bit arrays, so a row costs a couple of dozen bytes
+    plus its code and name strings, against roughly 700 for a record dict.
+    Totals and grades are derived for every row at once, with NumPy when it
+    is installed and C-level map()/translate() passes otherwise, rather than
+    per-row Python code.
+
+    Read-only and list-like: indexing or iterating builds the usual record
+    dict for just the rows asked for, so a listing pages through it directly.
+    """
+
+    def __init__(self):
+        self.codes = []
+        self.names = []
+        self.c1 = array(MARK_TYPE)
+        self.c2 = array(MARK_TYPE)
+        self.c3 = array(MARK_TYPE)
+        self.exam = array(MARK_TYPE)
+        self.coursework = array(MARK_TYPE)
+        self.totals = array(MARK_TYPE)
+        self.grades = b""
+
+    def __len__(self):
+        return len(self.codes)
+
+    @classmethod
+    def from_records(cls, students):
+        """Build columns from the dict-per-row records, keeping their order"""
+        cols = cls()
+        cols.codes = [s["code"] for s in students]
+        cols.names = [s["name"] for s in students]
+        cols.c1 = array(MARK_TYPE, [s["c1"] for s in students])
+        cols.c2 = array(MARK_TYPE, [s["c2"] for s in students])
+        cols.c3 = array(MARK_TYPE, [s["c3"] for s in students])
+        cols.exam = array(MARK_TYPE, [s["exam"] for s in students])
+        cols.compute()
+        return cols
+
+    @classmethod
+    def from_lines(cls, lines):
+        """Parse the studentMarks.txt body straight into columns, skipping dicts
+
+        Accepts and rejects exactly the lines parse_lines() does.
+        """
+        cols = cls()
+        lines = iter(lines)
+        # Skip blank lines before the count header
+        for line in lines:
+            if line.strip() != "":
+                break
+        for line in lines:
+            parts = line.split(",")
+            if len(parts) < 6:
+                continue
+            try:
+                # int() skips surrounding whitespace (and the newline) itself
+                c1, c2, c3 = int(parts[2]), int(parts[3]), int(parts[4])
+                exam = int(parts[5])
+            except ValueError:
+                continue
+            # Marks go in first, so a mark too big for the array leaves no half row
+            cols.c1.append(c1)
+            cols.c2.append(c2)
+            cols.c3.append(c3)
+            cols.exam.append(exam)
+            cols.codes.append(parts[0].strip())
+            cols.names.append(parts[1].strip())
+        cols.compute()
+        return cols
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_lines(f)
+
+    def compute(self):
+        """Derive coursework, totals and grades for all rows in one pass each"""
+        if np is not None:
+            self._compute_numpy()
+            return
+        self.coursework = array(MARK_TYPE, map(add, map(add, self.c1, self.c2), self.c3))
+        self.totals = array(MARK_TYPE, map(add, self.coursework, self.exam))
+        try:
+            self.grades = array("B", self.totals).tobytes().translate(GRADE_TABLE)
+        except OverflowError:
+            self.grades = None  # a total below 0 or above 255
+        if self.grades is None or b"?" in self.grades:
+            self._grade_rows()
+
+    def _compute_numpy(self):
+        c1, c2, c3, exam = (self._view(a).astype(np.int64) for a in
+                            (self.c1, self.c2, self.c3, self.exam))
+        coursework = c1 + c2 + c3
+        totals = coursework + exam
+        if totals.size and (totals.min() < MARK_MIN or totals.max() > MARK_MAX):
+            raise OverflowError("total too large for the 32-bit columns")
+        self.coursework = array(MARK_TYPE, coursework.astype(np.intc).tobytes())
+        self.totals = array(MARK_TYPE, totals.astype(np.intc).tobytes())
+        if not totals.size or (totals.min() >= 0 and totals.max() <= MAX_TOTAL):
+            self.grades = np.frombuffer(GRADE_TABLE, dtype=np.uint8)[totals].tobytes()
+        else:
+            self._grade_rows()
+
+    def _grade_rows(self):
+        # Hand-edited file with out-of-range marks; grade row by row
+        self.grades = "".join(calc_grade(total_to_percentage(t)) for t in self.totals).encode()
+
+    @staticmethod
+    def _view(column):
+        """NumPy view sharing the array's memory"""
+        return np.frombuffer(column, dtype=np.intc)
+
+    def record(self, i):
+        """Rebuild the dict form of row i"""
+        return make_record(self.codes[i], self.names[i],
+                           self.c1[i], self.c2[i], self.c3[i], self.exam[i])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.record(j) for j in range(*i.indices(len(self)))]
+        return self.record(range(len(self))[i])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def percentage(self, i):
+        return total_to_percentage(self.totals[i])
+
+    def average_percentage(self):
+        """Class average percentage"""
+        if not self.totals:
+            return 0.0
+        if np is not None:
+            total = int(self._view(self.totals).sum(dtype=np.int64))
+        else:
+            total = sum(self.totals)
+        return total_to_percentage(total / len(self.totals))
+
+    def argmax(self):
+        """Row of the first student with the highest total (like max())"""
+        if np is not None:
+            return int(np.argmax(self._view(self.totals)))
+        return self.totals.index(max(self.totals))
+
+    def argmin(self):
+        """Row of the first student with the lowest total (like min())"""
+        if np is not None:
+            return int(np.argmin(self._view(self.totals)))
+        return self.totals.index(min(self.totals))
+
+    def grade_counts(self):
+        """Number of students in each grade band"""
+        return {g: self.grades.count(g.encode()) for g in "ABCDF"}
+
+    def total_counts(self):
+        """(total, how many students) pairs, for StudentStats.from_total_counts"""
+        if np is not None:
+            totals, counts = np.unique(self._view(self.totals), return_counts=True)
+            return zip(totals.tolist(), counts.tolist())
+        return Counter(self.totals).items()
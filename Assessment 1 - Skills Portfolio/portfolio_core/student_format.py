@@ -0,0 +1,19 @@
+def format_student_minimal(s, show_header=False):
+    """Format student data for display with emojis"""
+    lines = []
+    
+    lines.append(f"🎓 {s['name']}")
+    lines.append(f"🔢 Student ID: {s['code']}")
+    lines.append("")
+    lines.append(f"📊 Coursework: {s['c1']} • {s['c2']} • {s['c3']} → {s['coursework']}/60")
+    lines.append(f"📝 Exam: {s['exam']}/100")
+    lines.append("")
+    lines.append(f"📈 Overall: {s['percentage']:.2f}%")
+    lines.append(f"🏆 Grade: [{s['grade']}]")
+    lines.append("")
+    lines.append("─" * 50)
+    
+    return "\n".join(lines)
+
+# Set minimal format as default
+format_student = format_student_minimal
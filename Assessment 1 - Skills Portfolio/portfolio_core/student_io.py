@@ -0,0 +1,146 @@
+import csv
+import time
+from itertools import islice
+
+from .student_store import make_record
+
+# Rows are validated and added to the store this many at a time
+CHUNK_SIZE = 1000
+# Only the first few rejected rows are kept for the report; the rest are counted
+MAX_REPORTED_REJECTS = 50
+
+EXPORT_FIELDS = ["code", "name", "c1", "c2", "c3", "exam",
+                 "coursework", "total", "percentage", "grade"]
+
+class TransferReport:
+    """Counts and timing for one import or export"""
+
+    def __init__(self):
+        self.rows = 0
+        self.rejected = 0
+        self.rejects = []  # (line number, reason) for the first few rejects
+        self.seconds = 0.0
+
+    def reject(self, line_no, reason):
+        self.rejected += 1
+        if len(self.rejects) < MAX_REPORTED_REJECTS:
+            self.rejects.append((line_no, reason))
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def summary(self, verb):
+        text = f"{verb} {self.rows} rows in {self.seconds:.2f}s ({self.rows_per_second:,.0f} rows/s)."
+        if self.rejected:
+            text += f"\n{self.rejected} rows rejected."
+            for line_no, reason in self.rejects[:5]:
+                text += f"\n  line {line_no}: {reason}"
+        return text
+
+# ---------- Validation ----------
+def parse_mark(value, maximum):
+    try:
+        mark = int(value)
+    except ValueError:
+        raise ValueError(f"mark {value.strip()!r} is not a whole number")
+    if not 0 <= mark <= maximum:
+        raise ValueError(f"mark {mark} outside 0-{maximum}")
+    return mark
+
+def validate_row(row):
+    """Turn a code,name,c1,c2,c3,exam row into a record or raise ValueError"""
+    if len(row) < 6:
+        raise ValueError("expected code,name,c1,c2,c3,exam")
+    code, name = row[0].strip(), row[1].strip()
+    if not code.isdigit() or not 1000 <= int(code) <= 9999:
+        raise ValueError(f"student code {code!r} not in 1000-9999")
+    if not name or "," in name:
+        raise ValueError("name is empty or contains a comma")
+    c1, c2, c3 = (parse_mark(v, 20) for v in row[2:5])
+    exam = parse_mark(row[5], 100)
+    return make_record(code, name, c1, c2, c3, exam)
+
+def validate_batch(rows, store):
+    """Validate grid rows given as (row number, values, is_existing)
+
+    Returns (added, updated, errors); errors are (row number, reason). New rows
+    must not reuse a code from the store or from earlier rows in the batch.
+    """
+    added, updated, errors = [], [], []
+    codes = set()
+    for row_no, values, existing in rows:
+        try:
+            record = validate_row(values)
+        except ValueError as e:
+            errors.append((row_no, str(e)))
+            continue
+        if existing:
+            updated.append(record)
+            continue
+        if record["code"] in codes or store.has_code(record["code"]):
+            errors.append((row_no, f"duplicate student code {record['code']}"))
+            continue
+        codes.add(record["code"])
+        added.append(record)
+    return added, updated, errors
+
+# ---------- Import / export ----------
+def import_csv(path, store, chunk_size=CHUNK_SIZE):
+    """Stream a CSV of students into the store a chunk at a time
+
+    A first row that does not start with a number is treated as a header.
+    Rows that fail validation or reuse an existing code are reported, not added.
+    """
+    report = TransferReport()
+    start = time.perf_counter()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rows = enumerate(csv.reader(f), start=1)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            accepted = []
+            codes = set()
+            for line_no, row in chunk:
+                if not row or not "".join(row).strip():
+                    continue
+                if line_no == 1 and not row[0].strip().isdigit():
+                    continue  # header row
+                try:
+                    record = validate_row(row)
+                except ValueError as e:
+                    report.reject(line_no, str(e))
+                    continue
+                if record["code"] in codes or store.has_code(record["code"]):
+                    report.reject(line_no, f"duplicate student code {record['code']}")
+                    continue
+                codes.add(record["code"])
+                accepted.append(record)
+            store.add_many(accepted)
+            report.rows += len(accepted)
+    # Fold the imported rows into the data file in one rewrite
+    if report.rows:
+        store.compact()
+    report.seconds = time.perf_counter() - start
+    return report
+
+def export_csv(path, records, chunk_size=CHUNK_SIZE):
+    """Stream records (any iterable, e.g. a ranking walk) to a CSV file"""
+    report = TransferReport()
+    start = time.perf_counter()
+    records = iter(records)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_FIELDS)
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            writer.writerows(
+                [s["code"], s["name"], s["c1"], s["c2"], s["c3"], s["exam"],
+                 s["coursework"], s["total"], f"{s['percentage']:.2f}", s["grade"]]
+                for s in chunk)
+            report.rows += len(chunk)
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,110 @@
+import argparse
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+
+from .student_store import BACKENDS, make_record, open_store
+from .student_format import format_student_minimal
+from .student_io import TransferReport
+
+# Students formatted per worker task; big enough to amortise process overhead
+REPORT_CHUNK = 5000
+
+def report_text(s):
+    """One student's report as written to the reports file"""
+    return format_student_minimal(s) + "\n\n"
+
+def record_fields(s):
+    # Plain tuples pickle far smaller than the record dicts
+    return (s["code"], s["name"], s["c1"], s["c2"], s["c3"], s["exam"])
+
+def write_chunk(path, rows):
+    """Format (code, name, c1, c2, c3, exam) rows into path (runs in a worker process)"""
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(report_text(make_record(*row)))
+    return len(rows)
+
+def write_reports_serial(path, records, progress=None):
+    """Stream every report into path from this process"""
+    done = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for s in records:
+            f.write(report_text(s))
+            done += 1
+            if progress and done % REPORT_CHUNK == 0:
+                progress(done, None)
+    return done
+
+def generate_reports(records, out_path, workers=None, chunk_size=REPORT_CHUNK, progress=None):
+    """Write a report for every student to out_path, in roster order
+
+    The roster is split into chunks that a process pool formats into separate
+    part files, which are then concatenated in order. workers=1 streams
+    straight from this process instead; the file is byte-identical either way.
+    progress(done, total) is called after each chunk finishes.
+    """
+    report = TransferReport()
+    start = time.perf_counter()
+    tmp_path = out_path + ".tmp"
+
+    if workers == 1:
+        report.rows = write_reports_serial(tmp_path, records, progress)
+    else:
+        records = iter(records)
+        chunks = []
+        while True:
+            chunk = [record_fields(s) for s in islice(records, chunk_size)]
+            if not chunk:
+                break
+            chunks.append(chunk)
+        total = sum(map(len, chunks))
+
+        parts_dir = out_path + ".parts"
+        os.makedirs(parts_dir, exist_ok=True)
+        parts = [os.path.join(parts_dir, f"{i:06d}.txt") for i in range(len(chunks))]
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(write_chunk, part, chunk) for part, chunk in zip(parts, chunks)]
+                for future in as_completed(futures):
+                    report.rows += future.result()
+                    if progress:
+                        progress(report.rows, total)
+
+            # Parts finish in any order; stitch them back in roster order
+            with open(tmp_path, "wb") as out:
+                for part in parts:
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, out)
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+    os.replace(tmp_path, out_path)
+    report.seconds = time.perf_counter() - start
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a report for every student to one file")
+    parser.add_argument("target", nargs="?", default="studentReports.txt")
+    parser.add_argument("--backend", choices=BACKENDS, default="text")
+    parser.add_argument("--source", help="roster file (default: the backend's usual file)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU; 1 runs serially)")
+    args = parser.parse_args(argv)
+
+    store = open_store(args.backend, args.source)
+    if not store.exists():
+        parser.error(f"'{store.path}' not found")
+
+    def progress(done, total):
+        print(f"\r{done}/{total or '?'} reports", end="", file=sys.stderr, flush=True)
+
+    report = generate_reports(store.load(), args.target, args.workers, progress=progress)
+    print(file=sys.stderr)
+    print(report.summary("Wrote reports for"))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+import argparse
+import os
+import sqlite3
+import sys
+
+from .student_store import FILE, StudentStats, StudentStore, make_record
+
+# Default database used by the SQLite backend
+DB_FILE = "studentMarks.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,  -- keeps file/insertion order
+    code       TEXT NOT NULL UNIQUE,
+    code_lower TEXT NOT NULL,
+    name       TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    c1         INTEGER NOT NULL,
+    c2         INTEGER NOT NULL,
+    c3         INTEGER NOT NULL,
+    exam       INTEGER NOT NULL,
+    total      INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS students_code_lower ON students (code_lower);
+CREATE INDEX IF NOT EXISTS students_name_lower ON students (name_lower);
+CREATE INDEX IF NOT EXISTS students_total ON students (total, seq);
+"""
+
+COLUMNS = "code, name, c1, c2, c3, exam"
+INSERT = ("INSERT INTO students (code, code_lower, name, name_lower, c1, c2, c3, exam, total) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+def row_to_record(row):
+    return make_record(row[0], row[1], row[2], row[3], row[4], row[5])
+
+def record_params(s):
+    return (s["code"], s["code"].lower(), s["name"], s["name"].lower(),
+            s["c1"], s["c2"], s["c3"], s["exam"], s["total"])
+
+class SqlRanking:
+    """Same queries as StudentRanking, answered by the (total, seq) index"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def _query(self, order, limit=None):
+        sql = f"SELECT {COLUMNS} FROM students ORDER BY total {order}, seq"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        for row in self.store.conn.execute(sql):
+            yield row_to_record(row)
+
+    def __len__(self):
+        return self.store.conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+
+    def ascending(self):
+        return self._query("ASC")
+
+    def descending(self):
+        return self._query("DESC")
+
+    def top(self, k):
+        return list(self._query("DESC", k))
+
+    def bottom(self, k):
+        return list(self._query("ASC", k))
+
+    def best(self):
+        return next(self._query("DESC", 1), None)
+
+    def worst(self):
+        return next(self._query("ASC", 1), None)
+
+class SqliteStudentStore:
+    """StudentStore backed by a local SQLite database
+
+    Offers the same methods as the text-file store. Lookups, ranking and sorting
+    are SQL against indexed columns, and every edit is its own transaction, so
+    several workstations can share one database file.
+
+    The loaded rows and the stats are cached and kept in step with this
+    connection's own edits, so an edit never re-reads the table; they are only
+    rebuilt when PRAGMA data_version shows another connection changed it.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        # The background worker and the Tk thread share this connection
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.ranking = SqlRanking(self)
+        self._stats = None
+        self._stats_key = None  # PRAGMA data_version when the stats were counted
+        self.rows = {}   # seq -> record, as loaded and edited since
+        self.slots = {}  # code -> seq
+        self.students = self.rows.values()
+        self.signature = None  # PRAGMA data_version when rows were read
+        self.journal_entries = 0  # edits are committed directly; nothing to compact
+        self.hits = 0
+        self.misses = 0
+
+    def exists(self):
+        return True
+
+    def _data_version(self):
+        # Changes whenever another connection commits to the database
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self):
+        """Return all records in insertion order, re-querying only after changes"""
+        signature = self._data_version()
+        if signature == self.signature:
+            self.hits += 1
+            return self.students
+
+        self.misses += 1
+        rows = self.conn.execute(f"SELECT seq, {COLUMNS} FROM students ORDER BY seq")
+        self.rows = {row[0]: row_to_record(row[1:]) for row in rows}
+        self.slots = {s["code"]: seq for seq, s in self.rows.items()}
+        self.students = self.rows.values()
+        self.signature = signature
+        return self.students
+
+    def _cached(self, code):
+        """(seq, record) of code from the loaded rows, else the table, else (None, None)"""
+        seq = self.slots.get(code)
+        if seq is not None:
+            return seq, self.rows[seq]
+        # Not loaded (or loaded before another workstation added it): the old
+        # record is still needed so the stats can take its total back out
+        row = self.conn.execute(f"SELECT seq, {COLUMNS} FROM students WHERE code = ?",
+                                (code,)).fetchone()
+        return (row[0], row_to_record(row[1:])) if row else (None, None)
+
+    def _changed(self, edits):
+        """Mirror committed (seq, old record, new record) edits in the caches
+
+        Our own commits don't bump data_version, so the cached rows and stats
+        stay valid as long as every edit is applied to them here too.
+        """
+        if self.signature is None:
+            # Rows were never loaded, so old totals aren't known; recount later
+            self._stats = None
+            return
+        for seq, old, new in edits:
+            if new is None:
+                if old is not None:
+                    self.slots.pop(old["code"], None)
+                    self.rows.pop(seq, None)
+            elif old is not None and seq not in self.rows:
+                # Updated a row the loaded ones never had; they are out of date
+                self.signature = None
+            else:
+                # Assigning an existing seq keeps the row where it was
+                self.rows[seq] = new
+                self.slots[new["code"]] = seq
+            if self._stats is not None:
+                if old is not None:
+                    self._stats.remove(old)
+                if new is not None:
+                    self._stats.add(new)
+
+    @property
+    def stats(self):
+        """StudentStats for the current table
+
+        Counted with a GROUP BY off the (total, seq) index (at most one row per
+        possible total) and then updated edit by edit; recounted whenever
+        another workstation has changed the database.
+        """
+        signature = self._data_version()
+        if self._stats is None or self._stats_key != signature:
+            counts = self.conn.execute("SELECT total, COUNT(*) FROM students GROUP BY total")
+            self._stats = StudentStats.from_total_counts(counts)
+            self._stats_key = signature
+        return self._stats
+
+    def snapshot(self):
+        """The roster as last loaded, safe to read while later edits go ahead"""
+        return list(self.students)
+
+    def warm(self):
+        """Nothing to build; lookups and ranking are SQL against indexes"""
+
+    def best(self):
+        return self.ranking.best()
+
+    def worst(self):
+        return self.ranking.worst()
+
+    def get(self, code):
+        row = self.conn.execute(f"SELECT {COLUMNS} FROM students WHERE code_lower = ?",
+                                (code.strip().lower(),)).fetchone()
+        return row_to_record(row) if row else None
+
+    def has_code(self, code):
+        return self.get(code) is not None
+
+    def find(self, key):
+        """First record whose code is key or whose name contains key (any case)"""
+        keyl = key.strip().lower()
+        row = self.conn.execute(
+            f"SELECT {COLUMNS} FROM students WHERE code_lower = ? OR instr(name_lower, ?) > 0 "
+            "ORDER BY seq LIMIT 1", (keyl, keyl)).fetchone()
+        return row_to_record(row) if row else None
+
+    def find_all(self, key, limit=None):
+        """All records matching like find(), in insertion order"""
+        keyl = key.strip().lower()
+        sql = (f"SELECT {COLUMNS} FROM students WHERE code_lower = ? OR instr(name_lower, ?) > 0 "
+               "ORDER BY seq")
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [row_to_record(row) for row in self.conn.execute(sql, (keyl, keyl))]
+
+    def add(self, record):
+        self.add_many([record])
+
+    def add_many(self, records):
+        if not records:
+            return
+        with self.conn:
+            edits = [self._insert(record) for record in records]
+        self._changed(edits)
+
+    def _insert(self, record):
+        cur = self.conn.execute(INSERT, record_params(record))
+        return cur.lastrowid, None, record
+
+    def _upsert(self, record):
+        params = record_params(record)
+        seq, old = self._cached(record["code"])
+        cur = self.conn.execute(
+            "UPDATE students SET name = ?, name_lower = ?, c1 = ?, c2 = ?, c3 = ?, exam = ?, total = ? "
+            "WHERE code = ?", params[2:] + (params[0],))
+        if cur.rowcount == 0:
+            return self._insert(record)
+        return seq, old, record
+
+    def update(self, record):
+        with self.conn:
+            edit = self._upsert(record)
+        self._changed([edit])
+
+    def apply_batch(self, added, updated):
+        """Add and update many records in one transaction"""
+        if not added and not updated:
+            return
+        with self.conn:
+            edits = [self._insert(record) for record in added]
+            edits += [self._upsert(record) for record in updated]
+        self._changed(edits)
+
+    def delete(self, code):
+        with self.conn:
+            seq, old = self._cached(code)
+            cur = self.conn.execute("DELETE FROM students WHERE code = ?", (code,))
+        self._changed([(seq, old, None)] if cur.rowcount else [])
+        return cur.rowcount > 0
+
+    def save(self, students):
+        """Replace every record in one transaction (first of any duplicate codes wins)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM students")
+            self.conn.executemany(INSERT.replace("INSERT", "INSERT OR IGNORE", 1),
+                                  [record_params(s) for s in students])
+        # Everything changed; reload and recount on next use
+        self.signature = None
+        self._stats = None
+
+    def compact(self):
+        pass
+
+    def invalidate(self):
+        self.signature = None
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "records": len(self.rows), "journal": 0}
+
+# ---------- Migration ----------
+def migrate_text_to_sqlite(text_path=FILE, db_path=DB_FILE):
+    """Copy every record (journal replayed) from the text file into SQLite"""
+    students = StudentStore(text_path).load()
+    db = SqliteStudentStore(db_path)
+    db.save(students)
+    db.conn.close()
+    return len(students)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Student Manager storage tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="copy studentMarks.txt into a SQLite database")
+    migrate.add_argument("source", nargs="?", default=FILE)
+    migrate.add_argument("target", nargs="?", default=DB_FILE)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        parser.error(f"'{args.source}' not found")
+    count = migrate_text_to_sqlite(args.source, args.target)
+    print(f"Migrated {count} students from {args.source} to {args.target}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,778 @@
+import os
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import islice
+from math import sqrt
+
+# File where student data is stored
+FILE = "studentMarks.txt"
+
+# Edits are appended here and folded into FILE by StudentStore.compact()
+JOURNAL_SUFFIX = ".journal"
+# Compact automatically once the journal holds this many edits
+COMPACT_EVERY = 500
+
+# ---------- Record helpers ----------
+def calc_grade(p):
+    """Calculate letter grade based on percentage"""
+    if p >= 70: return "A"
+    if p >= 60: return "B"
+    if p >= 50: return "C"
+    if p >= 40: return "D"
+    return "F"
+
+def make_record(code, name, c1, c2, c3, exam):
+    """Build a student record with totals, percentage and grade"""
+    coursework_total = c1 + c2 + c3
+    overall_total = coursework_total + exam
+    percentage = (overall_total / 160) * 100
+    return {
+        "code": code,
+        "name": name,
+        "c1": c1,
+        "c2": c2,
+        "c3": c3,
+        "coursework": coursework_total,
+        "exam": exam,
+        "total": overall_total,
+        "percentage": percentage,
+        "grade": calc_grade(percentage)
+    }
+
+def recalc_record(s):
+    """Refresh the derived fields of a record after its marks changed"""
+    s["coursework"] = s["c1"] + s["c2"] + s["c3"]
+    s["total"] = s["coursework"] + s["exam"]
+    s["percentage"] = (s["total"] / 160) * 100
+    s["grade"] = calc_grade(s["percentage"])
+    return s
+
+def parse_line(line):
+    """Parse one 'code,name,c1,c2,c3,exam' line, or return None if invalid"""
+    parts = [p.strip() for p in line.split(",")]
+    if len(parts) < 6:
+        return None
+    try:
+        # Convert marks to integers
+        c1, c2, c3 = int(parts[2]), int(parts[3]), int(parts[4])
+        exam = int(parts[5])
+    except ValueError:
+        return None
+    return make_record(parts[0], parts[1], c1, c2, c3, exam)
+
+def parse_lines(lines):
+    """Parse the file body (count header first) into student records"""
+    students = []
+    lines = iter(lines)
+    # Skip blank lines before the count header
+    for line in lines:
+        if line.strip() != "":
+            break
+    for line in lines:
+        if line.strip() == "":
+            continue
+        record = parse_line(line.rstrip("\n"))
+        if record is not None:
+            students.append(record)
+    return students
+
+def format_line(s):
+    """Serialise a record back to the text file format"""
+    return f"{s['code']},{s['name']},{s['c1']},{s['c2']},{s['c3']},{s['exam']}\n"
+
+# ---------- Journal helpers ----------
+def format_journal_entry(op, s):
+    """Serialise an edit: 'A'/'U' carry the full record, 'D' only the code"""
+    if op == "D":
+        return f"D,{s['code']}\n"
+    return f"{op}," + format_line(s)
+
+def apply_journal(students, lines):
+    """Replay journal lines onto students
+
+    Returns (students, entries applied, torn_at): torn_at is None for a clean
+    journal, else the byte length of its good prefix, so the caller can cut
+    off the torn tail before anything else is appended after it.
+    """
+    # Position of each code so replay stays O(N + edits)
+    index = {}
+    for i, s in enumerate(students):
+        index.setdefault(s["code"], i)
+
+    applied = 0
+    good = 0  # bytes of the journal replayed so far
+    torn_at = None
+    for raw in lines:
+        if not raw.endswith("\n"):
+            # Torn write from a crash: even a line that parses may be cut short
+            torn_at = good
+            break
+        size = len(raw.encode("utf-8"))
+        op, _, rest = raw.rstrip("\n").partition(",")
+        if op == "D":
+            code = rest.strip()
+            i = index.pop(code, None)
+            if i is not None:
+                students[i] = None
+        elif op in ("A", "U"):
+            record = parse_line(rest)
+            if record is None:
+                # Garbled entry; nothing after it can be trusted
+                torn_at = good
+                break
+            i = index.get(record["code"])
+            if i is None:
+                index[record["code"]] = len(students)
+                students.append(record)
+            else:
+                students[i] = record
+        else:
+            good += size
+            continue
+        good += size
+        applied += 1
+
+    return [s for s in students if s is not None], applied, torn_at
+
+# ---------- Lookup index ----------
+def trigrams(text):
+    """All 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class StudentIndex:
+    """Exact index on student code plus a trigram index on lowercased names
+
+    Each record gets an increasing sequence number so that, like the old linear
+    scan, find() returns the earliest record in file order that matches.
+    The name index is several times the size of the roster, so it is only
+    built on the first substring search; code lookups never need it.
+    """
+
+    def __init__(self, students=()):
+        self.by_code = {}   # lowercased code -> record
+        self.seq = {}       # lowercased code -> position in insertion order
+        self.names = None   # lowercased code -> lowercased name as indexed
+        self.grams = None   # trigram -> set of lowercased codes
+        self.next_seq = 0
+        for s in students:
+            self.add(s)
+
+    def _index_name(self, code, name):
+        self.names[code] = name
+        for g in trigrams(name):
+            self.grams.setdefault(g, set()).add(code)
+
+    def _build_names(self):
+        self.names, self.grams = {}, {}
+        for code, s in self.by_code.items():
+            self._index_name(code, s["name"].lower())
+
+    def add(self, s):
+        code = s["code"].lower()
+        if code in self.by_code:
+            return  # duplicate code in the file; the first one wins
+        self.by_code[code] = s
+        self.seq[code] = self.next_seq
+        self.next_seq += 1
+        if self.names is not None:
+            self._index_name(code, s["name"].lower())
+
+    def remove(self, s):
+        code = s["code"].lower()
+        if self.by_code.pop(code, None) is None:
+            return
+        self.seq.pop(code)
+        if self.names is None:
+            return
+        # Records are edited in place, so use the name as it was indexed
+        for g in trigrams(self.names.pop(code)):
+            codes = self.grams.get(g)
+            if codes is not None:
+                codes.discard(code)
+                if not codes:
+                    del self.grams[g]
+
+    def replace(self, s):
+        """Re-index a record whose name may have changed, keeping its position"""
+        code = s["code"].lower()
+        seq = self.seq.get(code)
+        self.remove(s)
+        self.add(s)
+        if seq is not None:
+            self.seq[code] = seq
+
+    def get(self, code):
+        return self.by_code.get(code.strip().lower())
+
+    def _candidates(self, keyl):
+        if self.names is None:
+            self._build_names()
+        candidates = set()
+        if keyl in self.by_code:
+            candidates.add(keyl)
+
+        if len(keyl) >= 3:
+            # Intersect postings, smallest first, then confirm the substring
+            postings = sorted((self.grams.get(g, set()) for g in trigrams(keyl)), key=len)
+            names = set(postings[0]).intersection(*postings[1:])
+            candidates.update(c for c in names if keyl in self.names[c])
+        else:
+            # Too short for trigrams; fall back to scanning names
+            candidates.update(c for c, name in self.names.items() if keyl in name)
+        return candidates
+
+    def find(self, key):
+        """Earliest record whose code equals key or whose name contains it"""
+        candidates = self._candidates(key.strip().lower())
+        if not candidates:
+            return None
+        return self.by_code[min(candidates, key=self.seq.__getitem__)]
+
+    def find_all(self, key, limit=None):
+        """Every matching record in file order, optionally only the first limit"""
+        candidates = sorted(self._candidates(key.strip().lower()), key=self.seq.__getitem__)
+        return [self.by_code[c] for c in candidates[:limit]]
+
+# ---------- Ranking by total ----------
+class StudentRanking:
+    """Students kept in order of total mark, updated incrementally on edits
+
+    Totals are whole numbers (out of 160), so records sit in one bucket per
+    total; each bucket is ordered by insertion sequence, which keeps ties in
+    file order exactly like the stable sort/max/min it replaces.
+    """
+
+    def __init__(self, students=()):
+        self.buckets = {}  # total -> list of (seq, record), sorted by seq
+        self.keys = []     # distinct totals, ascending
+        self.where = {}    # id(record) -> (total, seq) as ranked
+        self.next_seq = 0
+        for s in students:
+            self.buckets.setdefault(s["total"], []).append((self.next_seq, s))
+            self.where[id(s)] = (s["total"], self.next_seq)
+            self.next_seq += 1
+        self.keys = sorted(self.buckets)
+
+    def __len__(self):
+        return len(self.where)
+
+    def _insert(self, s, seq):
+        total = s["total"]
+        bucket = self.buckets.get(total)
+        if bucket is None:
+            bucket = self.buckets[total] = []
+            insort(self.keys, total)
+        insort(bucket, (seq, s), key=lambda item: item[0])
+        self.where[id(s)] = (total, seq)
+
+    def _remove(self, s):
+        total, seq = self.where.pop(id(s))
+        bucket = self.buckets[total]
+        del bucket[bisect_left(bucket, seq, key=lambda item: item[0])]
+        if not bucket:
+            del self.buckets[total]
+            del self.keys[bisect_left(self.keys, total)]
+        return seq
+
+    def add(self, s):
+        self._insert(s, self.next_seq)
+        self.next_seq += 1
+
+    def remove(self, s):
+        if id(s) in self.where:
+            self._remove(s)
+
+    def replace(self, old, new):
+        """Re-rank a record after an edit, keeping its place among ties"""
+        if id(old) not in self.where:
+            self.add(new)
+            return
+        if old is new and self.where[id(old)][0] == new["total"]:
+            return
+        self._insert(new, self._remove(old))
+
+    def ascending(self):
+        for total in self.keys:
+            for _, s in self.buckets[total]:
+                yield s
+
+    def descending(self):
+        for total in reversed(self.keys):
+            for _, s in self.buckets[total]:
+                yield s
+
+    def top(self, k):
+        return list(islice(self.descending(), k))
+
+    def bottom(self, k):
+        return list(islice(self.ascending(), k))
+
+    def best(self):
+        """First student (in file order) with the highest total"""
+        if not self.keys:
+            return None
+        return self.buckets[self.keys[-1]][0][1]
+
+    def worst(self):
+        """First student (in file order) with the lowest total"""
+        if not self.keys:
+            return None
+        return self.buckets[self.keys[0]][0][1]
+
+# ---------- Running statistics ----------
+# Totals are out of 160; anything outside 0..MAX_TOTAL is tracked separately
+MAX_TOTAL = 160
+GRADES = ("A", "B", "C", "D", "F")
+
+def total_to_percentage(total):
+    return (total / MAX_TOTAL) * 100
+
+class TotalCounts:
+    """How many students have each total, with k-th smallest lookup
+
+    A Fenwick tree over the 161 possible totals, so adding, removing and
+    finding the k-th total all take a handful of steps whatever the roster
+    size. Totals outside 0..160 (hand-edited files) go in a small sorted list.
+    """
+
+    def __init__(self):
+        self.tree = [0] * (MAX_TOTAL + 2)  # 1-based
+        self.in_range = 0
+        self.others = []
+        self.top_bit = 1 << (MAX_TOTAL + 1).bit_length()
+
+    def __len__(self):
+        return self.in_range + len(self.others)
+
+    def change(self, total, delta):
+        """Count total delta more (or fewer, if negative) times"""
+        if not 0 <= total <= MAX_TOTAL:
+            if delta > 0:
+                for _ in range(delta):
+                    insort(self.others, total)
+            else:
+                for _ in range(-delta):
+                    del self.others[bisect_left(self.others, total)]
+            return
+        self.in_range += delta
+        i = total + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def kth(self, k):
+        """k-th smallest total, counting from 0"""
+        low = bisect_left(self.others, 0)
+        if k < low:
+            return self.others[k]
+        k -= low
+        if k >= self.in_range:
+            return self.others[low + k - self.in_range]
+        # Walk down the tree to the first position whose prefix count exceeds k
+        pos, step = 0, self.top_bit
+        while step:
+            nxt = pos + step
+            if nxt < len(self.tree) and self.tree[nxt] <= k:
+                pos = nxt
+                k -= self.tree[nxt]
+            step >>= 1
+        return pos  # position pos + 1 in the tree holds total pos
+
+class StudentStats:
+    """Class-wide statistics kept up to date edit by edit
+
+    Count, sum and sum of squares of totals give the mean and standard
+    deviation, a per-grade counter gives the histogram and TotalCounts gives
+    the median, so no edit ever rescans the roster.
+    """
+
+    def __init__(self, students=()):
+        self.count = 0
+        self.total_sum = 0
+        self.total_sq = 0  # integers, so repeated edits never drift
+        self.grades = dict.fromkeys(GRADES, 0)
+        self.totals = TotalCounts()
+        # id(record) -> total as counted, so a record edited in place can still
+        # be taken back out at its old total
+        self.counted = {id(s): s["total"] for s in students}
+        # One update per distinct total rather than per student
+        for total, n in Counter(self.counted.values()).items():
+            self._change(total, n)
+
+    @classmethod
+    def from_total_counts(cls, counts):
+        """Build from (total, how many) pairs, e.g. a GROUP BY total query
+
+        These records aren't tracked, so they are removed at their current total.
+        """
+        stats = cls()
+        for total, n in counts:
+            stats._change(total, n)
+        return stats
+
+    def _change(self, total, n):
+        self.count += n
+        self.total_sum += n * total
+        self.total_sq += n * total * total
+        grade = calc_grade(total_to_percentage(total))
+        self.grades[grade] = self.grades.get(grade, 0) + n
+        self.totals.change(total, n)
+
+    def add(self, s):
+        self.counted[id(s)] = s["total"]
+        self._change(s["total"], 1)
+
+    def remove(self, s):
+        self._change(self.counted.pop(id(s), s["total"]), -1)
+
+    def replace(self, old, new):
+        """Recount a record after an edit (old may be new, edited in place)"""
+        total = self.counted.pop(id(old), old["total"])
+        self.counted[id(new)] = new["total"]
+        if total != new["total"]:
+            self._change(total, -1)
+            self._change(new["total"], 1)
+
+    def mean(self):
+        """Class average percentage"""
+        if not self.count:
+            return 0.0
+        return total_to_percentage(self.total_sum / self.count)
+
+    def stdev(self):
+        """Population standard deviation of the percentages"""
+        if not self.count:
+            return 0.0
+        # n^2 * variance, exact in integers
+        spread = self.count * self.total_sq - self.total_sum * self.total_sum
+        return total_to_percentage(sqrt(spread) / self.count)
+
+    def median(self):
+        """Median percentage (mean of the middle two for an even count)"""
+        if not self.count:
+            return 0.0
+        mid = self.count // 2
+        if self.count % 2:
+            return total_to_percentage(self.totals.kth(mid))
+        return total_to_percentage((self.totals.kth(mid - 1) + self.totals.kth(mid)) / 2)
+
+    def summary(self):
+        """Plain snapshot for handing to the UI thread"""
+        return {"count": self.count, "mean": self.mean(), "median": self.median(),
+                "stdev": self.stdev(), "grades": dict(self.grades)}
+
+# ---------- Cached store ----------
+def lazy_structure(attr, build):
+    """Property that builds a lookup structure from the roster on first use"""
+    def get(self):
+        if getattr(self, attr) is None:
+            setattr(self, attr, build(self))
+        return getattr(self, attr)
+
+    def set(self, value):
+        setattr(self, attr, value)
+    return property(get, set)
+
+def build_stats(store):
+    if store.rows is None:
+        # Read-only roster: count totals straight from its columns
+        return StudentStats.from_total_counts(store.students.total_counts())
+    return StudentStats(store.students)
+
+class StudentStore:
+    """Keeps the parsed roster in memory and re-reads the file only when it changes
+
+    Single-record edits are appended to a journal next to the data file instead
+    of rewriting it; compact() folds the journal back in with an atomic rename.
+
+    load() parses the file into StudentColumns, a read-only array-backed
+    roster, so listing, the stats and highest/lowest never build a dict per
+    row. The first lookup, sort or edit swaps it for editable records in an
+    insertion-ordered dict keyed by row number, so an edit finds, replaces or
+    drops its row in O(1); students is then a live view of it.
+    """
+
+    index = lazy_structure("_index", lambda store: StudentIndex(store._editable()))
+    ranking = lazy_structure("_ranking", lambda store: StudentRanking(store._editable()))
+    stats = lazy_structure("_stats", build_stats)
+
+    def __init__(self, path=FILE):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self._rebuild([])
+        self.signature = None  # stat of the data file and journal we last read
+        self.journal_entries = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _file_signature(self):
+        st = os.stat(self.path)
+        try:
+            jst = os.stat(self.journal_path)
+            journal = (jst.st_mtime_ns, jst.st_size)
+        except FileNotFoundError:
+            journal = None
+        return (st.st_mtime_ns, st.st_size, journal)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Return the cached records, re-parsing only if mtime or size changed"""
+        signature = self._file_signature()
+        if signature == self.signature:
+            self.hits += 1
+            return self.students
+
+        self.misses += 1
+        students = self._read_data()
+
+        # Replay edits made since the last compaction
+        self.journal_entries = 0
+        if signature[2] is not None:
+            with open(self.journal_path, "r", encoding="utf-8", newline="") as f:
+                students, self.journal_entries, torn_at = apply_journal(list(students), f)
+            if torn_at is not None:
+                # Drop the torn tail, or the next append would run on from it
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(torn_at)
+                    f.flush()
+                    os.fsync(f.fileno())
+                signature = self._file_signature()
+
+        self._rebuild(students)
+        self.signature = signature
+        return self.students
+
+    def _read_data(self):
+        """Parse every record in the data file into columns"""
+        # Imported here as student_columns builds on this module
+        from .student_columns import StudentColumns
+        try:
+            return StudentColumns.from_file(self.path)
+        except OverflowError:
+            # Marks too big for 32-bit columns (a hand-edited file); use dicts
+            with open(self.path, "r", encoding="utf-8") as f:
+                return parse_lines(f)
+
+    def _write_data(self, path, students):
+        """Write every record to path in the data file format"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(str(len(students)) + "\n")
+            for s in students:
+                f.write(format_line(s))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _set_rows(self, students):
+        """Hold students in file order, remembering the row edits to each code apply to"""
+        self.rows = dict(enumerate(students))
+        self.slots = {}  # lowercased code -> row (the first one, like the index)
+        for row, s in self.rows.items():
+            self.slots.setdefault(s["code"].lower(), row)
+        self.next_row = len(self.rows)
+        self.students = self.rows.values()
+
+    def _rebuild(self, students):
+        """Take a freshly loaded roster; index, ranking and stats follow on first use"""
+        if not hasattr(students, "total_counts"):
+            self._set_rows(students)
+        else:
+            # Read-only roster (StudentColumns, or a mapped binary file)
+            self.students = students
+            self.rows = None
+            self.slots = {}
+        self._index = self._ranking = self._stats = None
+
+    def _editable(self):
+        """Editable records, swapping a read-only roster for them the first time"""
+        if self.rows is None:
+            self._rebuild(list(self.students))
+        return self.students
+
+    def _materialise(self):
+        """Build every structure before an edit, so it is applied to each exactly once"""
+        for name in ("index", "ranking", "stats"):
+            getattr(self, name)
+
+    def snapshot(self):
+        """The roster as it is now, safe to read while later edits go ahead"""
+        if self.rows is None:
+            # A read-only roster is never edited in place, so it can be shared as is
+            return self.students
+        return list(self.students)
+
+    def warm(self):
+        """Build the lookup structures ahead of the first query
+
+        A read-only roster only gets its stats: the index and ranking need a
+        dict per row, which is what the columns save, so they wait for the
+        first lookup, sort or edit.
+        """
+        names = ("stats",) if self.rows is None else ("index", "ranking", "stats")
+        for name in names:
+            getattr(self, name)
+
+    def best(self):
+        """Highest-scoring record, the first in file order on a tie"""
+        if self.rows is None and hasattr(self.students, "argmax"):
+            return self.students[self.students.argmax()]
+        return self.ranking.best()
+
+    def worst(self):
+        """Lowest-scoring record, the first in file order on a tie"""
+        if self.rows is None and hasattr(self.students, "argmin"):
+            return self.students[self.students.argmin()]
+        return self.ranking.worst()
+
+    def get(self, code):
+        """Record with exactly this student code, or None"""
+        return self.index.get(code)
+
+    def has_code(self, code):
+        return self.index.get(code) is not None
+
+    def find(self, key):
+        """First record whose code is key or whose name contains key (any case)"""
+        return self.index.find(key)
+
+    def find_all(self, key, limit=None):
+        """All records matching like find(), in file order"""
+        return self.index.find_all(key, limit)
+
+    def _find(self, code):
+        """Row of the record with this code, or None"""
+        return self.slots.get(code.strip().lower())
+
+    def _append_journal(self, op, record):
+        self._write_journal([(op, record)])
+
+    def _write_journal(self, entries, auto_compact=True):
+        """Append (op, record) entries with one write and one fsync"""
+        if not self.exists():
+            # No data file to journal against yet; write it out in full
+            self.save(self.students)
+            return
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write("".join(format_journal_entry(op, r) for op, r in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_entries += len(entries)
+        if auto_compact and self.journal_entries >= COMPACT_EVERY:
+            self.compact()
+        else:
+            self.signature = self._file_signature()
+
+    def _insert(self, record):
+        row = self.next_row
+        self.next_row += 1
+        self.rows[row] = record
+        self.slots.setdefault(record["code"].lower(), row)
+        self.index.add(record)
+        self.ranking.add(record)
+        self.stats.add(record)
+
+    def _replace(self, record):
+        row = self._find(record["code"])
+        if row is None:
+            self._insert(record)
+        else:
+            # Assigning to an existing key keeps the record's place in the order
+            old = self.rows[row]
+            self.rows[row] = record
+            self.index.replace(record)
+            self.ranking.replace(old, record)
+            self.stats.replace(old, record)
+
+    def add(self, record):
+        """Add a record and journal it"""
+        self._materialise()
+        self._insert(record)
+        self._append_journal("A", record)
+
+    def add_many(self, records):
+        """Add several records with a single journal write
+
+        Bulk loads skip automatic compaction; call compact() once at the end.
+        """
+        if not records:
+            return
+        self._materialise()
+        for record in records:
+            self._insert(record)
+        self._write_journal([("A", r) for r in records], auto_compact=False)
+
+    def update(self, record):
+        """Replace the record with the same code and journal it"""
+        self._materialise()
+        self._replace(record)
+        self._append_journal("U", record)
+
+    def apply_batch(self, added, updated):
+        """Add and update many records, persisted as one journal write"""
+        if not added and not updated:
+            return
+        self._materialise()
+        for record in added:
+            self._insert(record)
+        for record in updated:
+            self._replace(record)
+        self._write_journal([("A", r) for r in added] + [("U", r) for r in updated])
+
+    def delete(self, code):
+        """Remove the record with this code and journal it"""
+        self._materialise()
+        row = self.slots.pop(code.strip().lower(), None)
+        if row is None:
+            return False
+        record = self.rows.pop(row)
+        self.index.remove(record)
+        self.ranking.remove(record)
+        self.stats.remove(record)
+        self._append_journal("D", record)
+        return True
+
+    def save(self, students):
+        """Atomically write all records to the file and clear the journal"""
+        tmp_path = self.path + ".tmp"
+        self._write_data(tmp_path, students)
+        os.replace(tmp_path, self.path)
+
+        # Replaying a stale journal is harmless (edits are upserts), so a crash
+        # before this point never loses data
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.journal_entries = 0
+
+        if students is not self.students:
+            self._rebuild(students)
+        self.signature = self._file_signature()
+
+    def compact(self):
+        """Fold the journal into the main file"""
+        self.save(self.students)
+
+    def invalidate(self):
+        """Force the next load to re-read the file"""
+        self.signature = None
+
+    def cache_info(self):
+        """Return hit/miss counters for checking the cache is working"""
+        return {"hits": self.hits, "misses": self.misses,
+                "records": len(self.students), "journal": self.journal_entries}
+
+# ---------- Backend selection ----------
+BACKENDS = ("text", "sqlite", "binary")
+
+def open_store(backend="text", path=None):
+    """Open the roster with the 'text' (studentMarks.txt), 'sqlite' or 'binary' backend"""
+    if backend == "text":
+        return StudentStore(path or FILE)
+    if backend == "binary":
+        from .student_binary import BinaryStudentStore, BIN_FILE
+        return BinaryStudentStore(path or BIN_FILE)
+    if backend == "sqlite":
+        # Imported here so the text backend never loads sqlite3
+        from .student_sqlite import SqliteStudentStore, DB_FILE
+        return SqliteStudentStore(path or DB_FILE)
+    raise ValueError(f"unknown storage backend {backend!r}, expected one of {BACKENDS}")
@@ -0,0 +1,104 @@
+import logging
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Callbacks that start this late, or run this long, are logged as stalls
+BUDGET_ENV_VAR = "PORTFOLIO_FRAME_BUDGET_MS"
+DEFAULT_BUDGET_MS = 50
+# Stalls and the exit summary are also appended to this file when it is set
+LOG_ENV_VAR = "PORTFOLIO_WATCHDOG_LOG"
+# Upper edges (ms) of the jitter histogram buckets; the last bucket is open-ended
+JITTER_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250, 500)
+
+log = logging.getLogger("portfolio.watchdog")
+
+class LoopWatchdog:
+    """Drop-in for root.after() that notices when the Tk event loop falls behind
+
+    Every callback scheduled through after() records how much later than
+    asked it actually started (jitter) and how long it ran. Both feed a
+    histogram, and anything over the frame budget is logged with its name,
+    so stalls on a kiosk show up in the log rather than as a frozen screen.
+    Time spent inside untimed() (a modal dialog waiting on the user) is left
+    out of the callback's run time.
+    """
+
+    def __init__(self, root, budget_ms=None):
+        self.root = root
+        if budget_ms is None:
+            budget_ms = float(os.environ.get(BUDGET_ENV_VAR, DEFAULT_BUDGET_MS))
+        self.budget = budget_ms / 1000
+        self.histogram = [0] * (len(JITTER_BUCKETS_MS) + 1)
+        self.stalls = {}  # callback name -> [late starts, long runs, worst ms]
+        self.ticks = 0
+        self.worst_jitter = 0.0
+        self.excluded = 0.0  # untimed seconds inside the running callback
+
+        path = os.environ.get(LOG_ENV_VAR)
+        if path and not any(getattr(h, "baseFilename", None) == os.path.abspath(path)
+                            for h in log.handlers):
+            handler = logging.FileHandler(path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+            log.addHandler(handler)
+            log.setLevel(logging.INFO)
+
+    def after(self, delay_ms, func, *args, name=None):
+        """Schedule func(*args) like root.after(), measuring when it really runs"""
+        name = name or getattr(func, "__name__", repr(func))
+        due = time.perf_counter() + delay_ms / 1000
+
+        def tick():
+            # Callbacks can nest (a modal dialog runs the event loop), so each
+            # keeps its own untimed total
+            outer, self.excluded = self.excluded, 0.0
+            start = time.perf_counter()
+            try:
+                func(*args)
+            finally:
+                duration = time.perf_counter() - start - self.excluded
+                self.excluded = outer
+                self.record(name, start - due, duration)
+        return self.root.after(int(delay_ms), tick)
+
+    @contextmanager
+    def untimed(self):
+        """Leave this block out of the running callback's time, e.g. a modal wait"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.excluded += time.perf_counter() - start
+
+    def record(self, name, jitter, duration):
+        jitter = max(0.0, jitter)
+        self.ticks += 1
+        self.worst_jitter = max(self.worst_jitter, jitter)
+        self.histogram[bisect_left(JITTER_BUCKETS_MS, jitter * 1000)] += 1
+
+        if jitter > self.budget or duration > self.budget:
+            entry = self.stalls.setdefault(name, [0, 0, 0.0])
+            entry[0] += jitter > self.budget
+            entry[1] += duration > self.budget
+            entry[2] = max(entry[2], jitter * 1000, duration * 1000)
+            log.warning("%s over %.0f ms budget: started %.1f ms late, ran %.1f ms",
+                        name, self.budget * 1000, jitter * 1000, duration * 1000)
+
+    def report(self):
+        """Jitter histogram and per-callback stall counts"""
+        lines = [f"Event-loop jitter over {self.ticks} after() callbacks "
+                 f"(worst {self.worst_jitter * 1000:.1f} ms):"]
+        lower = 0
+        for edge, count in zip(JITTER_BUCKETS_MS + (None,), self.histogram):
+            label = f"{lower}-{edge} ms" if edge is not None else f">{lower} ms"
+            share = count / self.ticks * 100 if self.ticks else 0.0
+            lines.append(f"  {label:>12} {count:>8} {share:6.1f}%")
+            lower = edge
+        for name, (late, slow, worst) in sorted(self.stalls.items()):
+            lines.append(f"  {name}: {late} late starts, {slow} long runs, worst {worst:.1f} ms")
+        return "\n".join(lines)
+
+    def close(self):
+        """Log the summary (kept at INFO, so it only lands in the watchdog log file)"""
+        log.info("%s", self.report())